@@ -0,0 +1,241 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
+
+from reviews.constants import BULK_BATCH_SIZE, BULK_MAX_ITEMS
+from reviews.models import Category, Genre, Title, TitleGenre
+from reviews.signals import bulk_loaded
+
+
+def get_bulk_items(request):
+    items = request.data
+    if not isinstance(items, list) or not items:
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ожидается непустой список объектов.'
+            ]
+        })
+    if len(items) > BULK_MAX_ITEMS:
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                f'За один запрос можно передать не больше {BULK_MAX_ITEMS} '
+                'объектов.'
+            ]
+        })
+    return items
+
+
+def raise_item_errors(errors):
+    """Отдает 400 со списком ошибок по позициям, если ошибка хоть одна."""
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+
+def collect_values(items, key):
+    values = set()
+    for item in items:
+        value = item.get(key) if isinstance(item, dict) else None
+        if isinstance(value, list):
+            values.update(slug for slug in value if isinstance(slug, str))
+        elif isinstance(value, str):
+            values.add(value)
+    return values
+
+
+def bulk_create_with_pks(model_class, objects):
+    """bulk_create, после которого у объектов гарантированно есть pk.
+
+    SQLite в Django 3.2 не возвращает id из bulk_create. Вызывается внутри
+    транзакции, а запись в SQLite в это время заблокирована, поэтому
+    новые строки - последние по автоинкрементному id.
+    """
+    model_class.objects.bulk_create(objects, batch_size=BULK_BATCH_SIZE)
+    if not objects or objects[0].pk is not None:
+        return
+    pks = model_class.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(objects)]
+    for obj, pk in zip(objects, reversed(pks)):
+        obj.pk = pk
+
+
+class BulkTagMixin:
+    """Массовое создание категорий и жанров: POST списка на `bulk/`."""
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        items = get_bulk_items(request)
+        model_class = self.get_queryset().model
+        serializers_list = [
+            self.get_serializer(data=item) for item in items
+        ]
+        for serializer in serializers_list:
+            slug_field = serializer.fields['slug']
+            slug_field.validators = [
+                validator for validator in slug_field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        errors = [
+            {} if serializer.is_valid() else serializer.errors
+            for serializer in serializers_list
+        ]
+        raise_item_errors(errors)
+
+        slugs = [
+            serializer.validated_data['slug']
+            for serializer in serializers_list
+        ]
+        taken = set(model_class.objects.filter(
+            slug__in=slugs
+        ).values_list('slug', flat=True))
+        seen = set()
+        for index, slug in enumerate(slugs):
+            if slug in taken or slug in seen:
+                errors[index] = {'slug': ['Такой slug уже существует.']}
+            seen.add(slug)
+        raise_item_errors(errors)
+
+        objects = [
+            model_class(**serializer.validated_data)
+            for serializer in serializers_list
+        ]
+        with transaction.atomic():
+            model_class.objects.bulk_create(
+                objects, batch_size=BULK_BATCH_SIZE
+            )
+        bulk_loaded.send(sender=model_class)
+        return Response(
+            self.get_serializer(objects, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class BulkTitleMixin:
+    """Массовое создание (POST) и изменение (PATCH) произведений на `bulk/`.
+
+    Жанры и категории из всего списка загружаются одним запросом на
+    модель, произведения и связи с жанрами пишутся пачками в одной
+    транзакции. Ошибки возвращаются списком по позициям запроса.
+    """
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        items = get_bulk_items(request)
+        context = self.get_serializer_context()
+        context['prefetched'] = {
+            Genre: Genre.objects.in_bulk(
+                collect_values(items, 'genre'), field_name='slug'
+            ),
+            Category: Category.objects.in_bulk(
+                collect_values(items, 'category'), field_name='slug'
+            ),
+        }
+        if request.method == 'POST':
+            return self.bulk_create_titles(items, context)
+        return self.bulk_update_titles(items, context)
+
+    def validate_bulk_items(self, items, instances, context):
+        serializer_class = self.get_serializer_class()
+        serializers_list = []
+        errors = []
+        for item, instance in zip(items, instances):
+            serializer = serializer_class(
+                instance, data=item, partial=instance is not None,
+                context=context
+            )
+            serializers_list.append(serializer)
+            errors.append({} if serializer.is_valid() else serializer.errors)
+        raise_item_errors(errors)
+        return serializers_list
+
+    def get_bulk_response(self, titles, status_code):
+        pks = [title.pk for title in titles]
+        fetched = self.get_queryset().in_bulk(pks)
+        return Response(
+            self.get_serializer(
+                [fetched[pk] for pk in pks], many=True
+            ).data,
+            status=status_code
+        )
+
+    def bulk_create_titles(self, items, context):
+        serializers_list = self.validate_bulk_items(
+            items, [None] * len(items), context
+        )
+        titles = []
+        title_genres = []
+        for serializer in serializers_list:
+            data = dict(serializer.validated_data)
+            genres = data.pop('genre')
+            title = Title(**data)
+            titles.append(title)
+            title_genres.extend(
+                TitleGenre(title=title, genre=genre)
+                for genre in dict.fromkeys(genres)
+            )
+        with transaction.atomic():
+            bulk_create_with_pks(Title, titles)
+            for title_genre in title_genres:
+                title_genre.title_id = title_genre.title.pk
+            TitleGenre.objects.bulk_create(
+                title_genres, batch_size=BULK_BATCH_SIZE
+            )
+        bulk_loaded.send(sender=Title)
+        return self.get_bulk_response(titles, status.HTTP_201_CREATED)
+
+    def bulk_update_titles(self, items, context):
+        ids = [item.get('id') if isinstance(item, dict) else None
+               for item in items]
+        instances = Title.objects.in_bulk(
+            [pk for pk in ids if isinstance(pk, int)]
+        )
+        errors = [
+            {} if isinstance(pk, int) and pk in instances
+            else {'id': ['Произведение не найдено.']}
+            for pk in ids
+        ]
+        raise_item_errors(errors)
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Произведения в списке не должны повторяться.'
+                ]
+            })
+        serializers_list = self.validate_bulk_items(
+            items, [instances[pk] for pk in ids], context
+        )
+
+        now = timezone.now()
+        update_fields = {'edit_date'}
+        genres_by_title = {}
+        titles = []
+        for serializer in serializers_list:
+            data = dict(serializer.validated_data)
+            title = serializer.instance
+            if 'genre' in data:
+                genres_by_title[title.pk] = data.pop('genre')
+            for field, value in data.items():
+                setattr(title, field, value)
+            update_fields.update(data)
+            title.edit_date = now
+            titles.append(title)
+        with transaction.atomic():
+            Title.objects.bulk_update(
+                titles, sorted(update_fields), batch_size=BULK_BATCH_SIZE
+            )
+            if genres_by_title:
+                TitleGenre.objects.filter(
+                    title_id__in=genres_by_title
+                ).delete()
+                TitleGenre.objects.bulk_create(
+                    [TitleGenre(title_id=pk, genre=genre)
+                     for pk, genres in genres_by_title.items()
+                     for genre in dict.fromkeys(genres)],
+                    batch_size=BULK_BATCH_SIZE
+                )
+        bulk_loaded.send(sender=Title)
+        return self.get_bulk_response(titles, status.HTTP_200_OK)
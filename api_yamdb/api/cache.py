@@ -0,0 +1,133 @@
+import time
+from hashlib import md5
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.conditional import is_etag_matched
+
+NAMESPACE_KEY_TEMPLATE = 'api:namespace:{}'
+RESPONSE_KEY_TEMPLATE = 'api:response:{}'
+TITLES_NAMESPACE = 'titles'
+CATEGORIES_NAMESPACE = 'categories'
+GENRES_NAMESPACE = 'genres'
+USERS_NAMESPACE = 'users'
+
+
+def get_namespace_versions(namespaces):
+    """Возвращает текущие версии пространств имен кеша.
+
+    Версия - время последней инвалидации, поэтому вытесненный из кеша
+    счетчик не может вернуть к жизни старые ответы.
+    """
+    keys = [NAMESPACE_KEY_TEMPLATE.format(name) for name in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_namespaces(*namespaces):
+    """Инвалидирует все ответы, закешированные в пространствах имен.
+
+    Версии меняются после коммита текущей транзакции: иначе чтение,
+    попавшее между инвалидацией и коммитом, сохранило бы старые данные
+    под новой версией до истечения TTL.
+    """
+    transaction.on_commit(lambda: cache.set_many(
+        {NAMESPACE_KEY_TEMPLATE.format(name): time.time_ns()
+         for name in namespaces},
+        timeout=None
+    ))
+
+
+def get_bulk_namespace(namespace):
+    """Пространство имен, общее для всех объектов ресурса.
+
+    Сбрасывается при массовой загрузке, когда затронутые объекты неизвестны.
+    """
+    return f'{namespace}-bulk'
+
+
+def get_response_cache_key(url, namespaces):
+    versions = get_namespace_versions(namespaces)
+    raw_key = '|'.join([url, *namespaces, *map(str, versions)])
+    return RESPONSE_KEY_TEMPLATE.format(md5(raw_key.encode()).hexdigest())
+
+
+class CachedListMixin:
+    """Кеширует ответы на анонимные GET-запросы списков.
+
+    Ключ строится по полному URL (путь, query string, номер страницы)
+    и версиям пространств имен, которые сбрасываются сигналами записи.
+    Вместе с данными хранится ETag ответа, если он был посчитан.
+    """
+
+    cache_namespace = None
+
+    def get_cache_namespaces(self):
+        return (self.cache_namespace,)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        key = get_response_cache_key(
+            request.build_absolute_uri(), self.get_cache_namespaces()
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            data, etag = cached
+            if etag and is_etag_matched(request, etag):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response(data)
+            if etag:
+                response['ETag'] = etag
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, (response.data, response.get('ETag')))
+        return response
+
+
+class CachedReadMixin(CachedListMixin):
+    """Кеширует анонимные GET-запросы списков и отдельных объектов.
+
+    Ответы detail-действий (retrieve и @action(detail=True)) сбрасываются
+    вместе с пространством имен объекта.
+    """
+
+    def get_cache_namespaces(self):
+        if self.detail:
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            return (f'{self.cache_namespace}-{lookup}',
+                    get_bulk_namespace(self.cache_namespace))
+        return super().get_cache_namespaces()
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class NamespaceEtagMixin:
+    """Добавляет в ETag версии пространств имен `etag_namespaces`.
+
+    Нужен, когда ответ зависит от связанных строк, правка которых не
+    видна в агрегате ETag: например, переименование автора отзыва.
+    """
+
+    etag_namespaces = ()
+
+    def get_etag_versions(self):
+        return [
+            *super().get_etag_versions(),
+            *get_namespace_versions(self.etag_namespaces)
+        ]
@@ -0,0 +1,88 @@
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def is_etag_matched(request, etag):
+    """Проверяет, совпадает ли ETag с заголовком If-None-Match."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in etags
+
+
+class ConditionalGetMixin:
+    """Поддержка условных GET-запросов по ETag.
+
+    ETag объекта считается по узкой выборке `etag_fields` (без
+    сериализатора), ETag списка - по одному агрегату `etag_aggregates`
+    над отфильтрованным списком и параметрам запроса: добавление,
+    удаление и правка строки меняют количество, последний id или
+    последнюю дату изменения. Совпадение с If-None-Match дает 304 без
+    пагинации и сериализации ответа. Данные, которых нет в агрегате
+    (например, имена авторов), учитываются через `get_etag_versions`.
+    """
+
+    etag_fields = ('pk', 'edit_date')
+    etag_aggregates = {
+        'count': Count('pk'),
+        'last_id': Max('pk'),
+        'last_edit_date': Max('edit_date'),
+    }
+    conditional_actions = ('list', 'retrieve')
+
+    def get_etag_rows(self):
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None)
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            rows = queryset.values(*self.etag_fields).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+            return sorted(map(repr, rows)) or None
+        aggregates = queryset.select_related(None).order_by().aggregate(
+            **self.etag_aggregates
+        )
+        return sorted(aggregates.items())
+
+    def get_etag_versions(self):
+        """Версии связанных данных, меняющие ETag вместе со строками."""
+        return []
+
+    def get_etag(self, request):
+        rows = self.get_etag_rows()
+        if rows is None:
+            return None
+        raw_etag = repr((
+            request.get_full_path(), request.accepted_renderer.format, rows,
+            self.get_etag_versions()
+        ))
+        return quote_etag(md5(raw_etag.encode()).hexdigest())
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+        etag = self.get_etag(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        if is_etag_matched(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK,
+                                    status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,68 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.decorators import action
+
+from api.permissions import IsRoleAdmin
+from api.renderers import FastJSONRenderer
+from api.rows import TitleRowSerializer
+from reviews.constants import EXPORT_CHUNK_SIZE
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+def get_after_id(request):
+    """Id, после которого продолжается выгрузка: `?after=<id>`."""
+    raw = request.query_params.get('after')
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise serializers.ValidationError({
+            'after': ['Ожидается id последнего полученного объекта.']
+        })
+
+
+def iterate_chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class TitleExportMixin:
+    """Потоковая выгрузка каталога в NDJSON: GET `export/`.
+
+    Одна строка - одно произведение в формате списка, с рейтингом,
+    жанрами и категорией. Произведения читаются по id через iterator()
+    пачками по EXPORT_CHUNK_SIZE, жанры догружаются одним запросом на
+    пачку, поэтому память не растет с размером каталога. Оборванную
+    выгрузку можно продолжить с `?after=<последний id>`.
+    """
+
+    export_chunk_size = EXPORT_CHUNK_SIZE
+
+    @action(detail=False, methods=['get'], url_path='export',
+            permission_classes=(IsRoleAdmin,))
+    def export(self, request):
+        after_id = get_after_id(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        if after_id is not None:
+            queryset = queryset.filter(pk__gt=after_id)
+        return StreamingHttpResponse(
+            self.iterate_export_lines(queryset.order_by('pk')),
+            content_type=NDJSON_CONTENT_TYPE
+        )
+
+    def iterate_export_lines(self, queryset):
+        renderer = FastJSONRenderer()
+        row_serializer = TitleRowSerializer()
+        rows = row_serializer.get_values(queryset).iterator(
+            chunk_size=self.export_chunk_size
+        )
+        for chunk in iterate_chunks(rows, self.export_chunk_size):
+            yield b''.join(
+                renderer.encode(title) + b'\n'
+                for title in row_serializer.serialize(chunk)
+            )
@@ -1,13 +1,43 @@
+from django.db.models import Exists, OuterRef
 from django_filters.rest_framework import CharFilter, FilterSet
+from rest_framework.filters import BaseFilterBackend
 
-from reviews.models import Title
+from reviews.models import Title, TitleGenre
+from reviews.search import filter_usernames_by_prefix, search_titles
 
 
 class TitleFilter(FilterSet):
     category = CharFilter(field_name='category__slug')
-    genre = CharFilter(field_name='genre__slug')
+    genre = CharFilter(method='filter_genre')
     name = CharFilter(field_name='name', lookup_expr='icontains')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         fields = ('category', 'genre', 'name', 'year')
         model = Title
+
+    def filter_genre(self, queryset, name, value):
+        """Фильтр по жанру через EXISTS, а не JOIN.
+
+        Так база идет по индексу года в порядке выдачи и проверяет жанр
+        по индексу (genre, title) - без сортировки всех произведений
+        жанра и без дублей строк.
+        """
+        return queryset.filter(Exists(TitleGenre.objects.filter(
+            title=OuterRef('pk'), genre__slug=value
+        )))
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class UsernamePrefixFilter(BaseFilterBackend):
+    """Поиск пользователей по началу username по индексу: `?prefix=adm`."""
+
+    prefix_query_param = 'prefix'
+
+    def filter_queryset(self, request, queryset, view):
+        prefix = request.query_params.get(self.prefix_query_param)
+        if prefix is None:
+            return queryset
+        return filter_usernames_by_prefix(queryset, prefix)
@@ -1,11 +1,193 @@
-from rest_framework import mixins
+from django.core.exceptions import FieldDoesNotExist
+from django.shortcuts import get_object_or_404
+from rest_framework import mixins, serializers
 from rest_framework.filters import SearchFilter
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from api.bulk import BulkTagMixin
+from api.cache import CachedListMixin
 from api.permissions import IsRoleAdminOrReadOnly
+from api.renderers import StreamingListMixin
+from reviews.constants import IDS_MAX_COUNT
 
 
-class MixinTagViewSet(mixins.DestroyModelMixin,
+class NestedParentMixin:
+    """Родительский объект вложенного маршрута.
+
+    Вся цепочка родителей проверяется одним запросом по `parent_lookups`
+    ({поле родителя: kwarg маршрута}), результат запоминается до конца
+    запроса.
+    """
+
+    parent_model = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model,
+                **{field: self.kwargs[kwarg]
+                   for field, kwarg in self.parent_lookups.items()}
+            )
+        return self._parent
+
+
+class IdListMixin:
+    """Выдача списка объектов по id: `?ids=3,1,2`.
+
+    Объекты возвращаются одним списком в порядке запрошенных id, без
+    пагинации и COUNT. Несуществующие id пропускаются, повторы
+    схлопываются.
+    """
+
+    ids_query_param = 'ids'
+    ids_max_count = IDS_MAX_COUNT
+
+    def get_requested_ids(self):
+        if not hasattr(self, '_requested_ids'):
+            self._requested_ids = None
+            raw = self.request.query_params.get(self.ids_query_param)
+            if self.action == 'list' and raw is not None:
+                self._requested_ids = self.parse_ids(raw)
+        return self._requested_ids
+
+    def parse_ids(self, raw):
+        try:
+            ids = list(dict.fromkeys(
+                int(value) for value in raw.split(',') if value.strip()
+            ))
+        except ValueError:
+            ids = []
+        if not ids or any(pk <= 0 for pk in ids):
+            raise serializers.ValidationError({
+                self.ids_query_param: [
+                    'Ожидается список положительных id через запятую.'
+                ]
+            })
+        if len(ids) > self.ids_max_count:
+            raise serializers.ValidationError({
+                self.ids_query_param: [
+                    f'За один запрос можно запросить не больше '
+                    f'{self.ids_max_count} объектов.'
+                ]
+            })
+        return ids
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ids = self.get_requested_ids()
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        ids = self.get_requested_ids()
+        if ids is None:
+            return super().paginate_queryset(queryset)
+        # Строки values() (быстрый list) тоже несут pk.
+        objects = {
+            obj['pk'] if isinstance(obj, dict) else obj.pk: obj
+            for obj in queryset
+        }
+        return [objects[pk] for pk in ids if pk in objects]
+
+    def get_paginated_response(self, data):
+        if self.get_requested_ids() is not None:
+            return Response(data)
+        return super().get_paginated_response(data)
+
+
+class SparseFieldsMixin:
+    """Частичная выдача полей: `?fields=id,name` и `?omit=description`.
+
+    Вместе с ответом сужается и выборка: читаются только колонки нужных
+    полей, JOIN и prefetch делаются лишь для запрошенных связей.
+    Поля сериализатора, которые не совпадают с полями модели, описываются
+    в `sparse_field_sources`, а `sparse_always_fields` загружаются всегда.
+    """
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    sparse_actions = ('list', 'retrieve')
+    sparse_field_sources = {}
+    sparse_always_fields = ()
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            params = self.request.query_params
+            if self.action in self.sparse_actions and (
+                self.fields_query_param in params
+                or self.omit_query_param in params
+            ):
+                self._sparse_fields = self.parse_sparse_fields(params)
+        return self._sparse_fields
+
+    def parse_sparse_fields(self, params):
+        available = list(self.get_serializer_class()().fields)
+        fields = available
+        errors = {}
+        for param in (self.fields_query_param, self.omit_query_param):
+            if param not in params:
+                continue
+            names = {name.strip() for name in params[param].split(',')}
+            names.discard('')
+            unknown = names.difference(available)
+            if unknown:
+                errors[param] = [
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+                ]
+            elif param == self.fields_query_param:
+                if not names:
+                    errors[param] = ['Укажите хотя бы одно поле.']
+                fields = [name for name in fields if name in names]
+            else:
+                fields = [name for name in fields if name not in names]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return frozenset(fields)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.get_sparse_fields()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return self.get_sparse_queryset(queryset, fields)
+
+    def get_sparse_queryset(self, queryset, fields):
+        opts = queryset.model._meta
+        columns = {opts.pk.name, *self.sparse_always_fields}
+        select_related = []
+        prefetch_related = []
+        for name in fields:
+            for source in self.sparse_field_sources.get(name, (name,)):
+                try:
+                    model_field = opts.get_field(source)
+                except FieldDoesNotExist:
+                    continue
+                if model_field.many_to_many or model_field.one_to_many:
+                    prefetch_related.append(source)
+                    continue
+                columns.add(source)
+                if model_field.is_relation:
+                    select_related.append(source)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        return queryset.prefetch_related(*prefetch_related).only(*columns)
+
+
+class MixinTagViewSet(StreamingListMixin,
+                      CachedListMixin,
+                      BulkTagMixin,
+                      SparseFieldsMixin,
+                      mixins.DestroyModelMixin,
                       mixins.ListModelMixin,
                       mixins.CreateModelMixin,
                       GenericViewSet):
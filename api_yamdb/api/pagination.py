@@ -0,0 +1,121 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       PageNumberPagination)
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная пагинация лент по ключу (pub_date, id).
+
+    Курсор хранит дату публикации и id крайней строки страницы, следующая
+    страница выбирается условием по этой паре. В отличие от курсора DRF,
+    одинаковые pub_date у многих строк не приводят к OFFSET.
+    """
+
+    ordering = ('-pub_date', '-id')
+    reverse_ordering = ('pub_date', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+        if reverse:
+            queryset = queryset.order_by(*self.reverse_ordering)
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            pub_date, pk = position
+            lookup = 'gt' if reverse else 'lt'
+            queryset = queryset.filter(
+                Q(**{f'pub_date__{lookup}': pub_date})
+                | Q(pub_date=pub_date, **{f'id__{lookup}': pk})
+            )
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = position is not None
+        if self.page:
+            self.next_position = self.get_key(self.page[-1])
+            self.previous_position = self.get_key(self.page[0])
+        else:
+            self.next_position = self.previous_position = position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_key(self, item):
+        """Ключ (pub_date, id) объекта или строки values()."""
+        if isinstance(item, dict):
+            return item['pub_date'], item['pk']
+        return item.pub_date, item.pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.next_position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.previous_position)
+        )
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            pub_date, pk = cursor.position.rsplit(',', 1)
+            position = (parse_datetime(pub_date), int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        pub_date, pk = cursor.position
+        return super().encode_cursor(Cursor(
+            offset=0,
+            reverse=cursor.reverse,
+            position=f'{pub_date.isoformat()},{pk}'
+        ))
+
+
+class FeedPagination(PageNumberPagination):
+    """Постраничная пагинация с опциональным курсорным режимом.
+
+    Если в запросе есть параметр `cursor` (в том числе пустой),
+    страница выбирается по ключу (pub_date, id) без COUNT и OFFSET.
+    """
+
+    cursor_pagination_class = PubDateCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        cursor_class = self.cursor_pagination_class
+        if cursor_class.cursor_query_param in request.query_params:
+            self.cursor_paginator = cursor_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,94 @@
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from reviews.constants import JSON_STREAM_CHUNK_SIZE, JSON_STREAM_MIN_ITEMS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STREAMED_STATUSES = (status.HTTP_200_OK, status.HTTP_201_CREATED)
+# DRF экранирует эти символы, чтобы JSON оставался подмножеством JavaScript.
+LINE_SEPARATORS = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer, который кодирует через orjson, если он установлен.
+
+    Без orjson, с отступами или с ensure_ascii работает стандартный
+    JSONRenderer. Типы, которых orjson не знает (даты, Decimal, ленивые
+    строки), кодируются энкодером DRF, поэтому ответ совпадает
+    с ответом стандартного рендерера.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return self.encode(data)
+
+    def encode(self, data):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data)
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+    def render_chunks(self, items, chunk_size=JSON_STREAM_CHUNK_SIZE):
+        """Кодирует список по частям, не собирая весь ответ в одну строку."""
+        yield b'['
+        for start in range(0, len(items), chunk_size):
+            chunk = self.encode(list(items[start:start + chunk_size]))
+            yield (b',' if start else b'') + chunk[1:-1]
+        yield b']'
+
+
+class StreamingListMixin:
+    """Отдает большие JSON-списки частями через StreamingHttpResponse.
+
+    Срабатывает для ответов-списков от `stream_min_items` элементов,
+    если выбран FastJSONRenderer без отступов.
+    """
+
+    stream_min_items = JSON_STREAM_MIN_ITEMS
+
+    def should_stream(self, response):
+        renderer = getattr(response, 'accepted_renderer', None)
+        return (
+            isinstance(renderer, FastJSONRenderer)
+            and response.status_code in STREAMED_STATUSES
+            and isinstance(response.data, list)
+            and len(response.data) >= self.stream_min_items
+            and not renderer.get_indent(response.accepted_media_type, {})
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if not self.should_stream(response):
+            return response
+        renderer = response.accepted_renderer
+        streaming = StreamingHttpResponse(
+            renderer.render_chunks(response.data),
+            status=response.status_code,
+            content_type=renderer.media_type
+        )
+        for header, value in response.items():
+            if header.lower() != 'content-type':
+                streaming[header] = value
+        return streaming
@@ -1,24 +1,77 @@
 from datetime import datetime
+from operator import attrgetter
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.validators import UnicodeUsernameValidator
-from django.core.mail import send_mail
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
-from reviews.constants import (BAN_USERNAME, DEFAULT_ROLE,
+from reviews.constants import (BANNED_USERNAMES, DEFAULT_ROLE,
                                DEFAULT_TITLE_RATING, EMAIL_MAX_LENGTH,
-                               MAX_SCORE_VALUE, MIN_SCORE_VALUE, ROLES,
-                               USERNAME_MAX_LENGTH)
+                               MAX_SCORE_VALUE, MIN_SCORE_VALUE,
+                               RESERVED_SLUGS, ROLES, USERNAME_MAX_LENGTH)
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.outbox import enqueue_email
 
 User = get_user_model()
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+def validate_username(username):
+    if username in BANNED_USERNAMES:
+        raise serializers.ValidationError('Некорректное имя пользователя.')
+    return username
+
+
+def validate_slug(slug):
+    if slug in RESERVED_SLUGS:
+        raise serializers.ValidationError('Некорректный slug.')
+    return slug
+
+
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объекты в заранее загруженном словаре.
+
+    Словарь {модель: {slug: объект}} передается в context['prefetched'],
+    без него поле работает как обычный SlugRelatedField.
+    """
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get('prefetched', {}).get(
+            self.get_queryset().model
+        )
+        if prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            return prefetched[data]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=smart_str(data))
+        except TypeError:
+            self.fail('invalid')
+
+
+class SparseFieldsSerializerMixin:
+    """Оставляет в ответе только поля из context['sparse_fields'].
+
+    Без этого ключа в контексте (или со значением None) выдаются все поля.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse_fields = self.context.get('sparse_fields')
+        if sparse_fields is None:
+            return fields
+        return {name: field for name, field in fields.items()
+                if name in sparse_fields}
+
+
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     """Сериализатор для работы с отзывами."""
 
     author = serializers.SlugRelatedField(
@@ -35,44 +88,54 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, attrs):
-        if self.context['request'].method == 'POST':
-            if Review.objects.filter(
-                author=self.context['request'].user,
-                title_id=self.context.get('view').kwargs.get('title_id')
-            ).exists():
-                raise serializers.ValidationError(
-                    'Вы уже оставили отзыв на это произведение.')
-
-        return attrs
-
-
-class GenreSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        # Повторный отзыв отсекает constraint unique_review, без
+        # отдельного запроса exists() и без гонки двух параллельных POST.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже оставили отзыв на это произведение.'
+                ]
+            })
+
+
+class GenreSerializer(SparseFieldsSerializerMixin,
+                      serializers.ModelSerializer):
     """Сериализатор для работы с жанрами."""
 
     class Meta:
         fields = ('name', 'slug')
         model = Genre
 
+    def validate_slug(self, slug):
+        return validate_slug(slug)
 
-class CategorySerializer(serializers.ModelSerializer):
+
+class CategorySerializer(SparseFieldsSerializerMixin,
+                         serializers.ModelSerializer):
     """Сериализатор для работы с категориями."""
 
     class Meta:
         fields = ('name', 'slug')
         model = Category
 
+    def validate_slug(self, slug):
+        return validate_slug(slug)
+
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsSerializerMixin,
+                      serializers.ModelSerializer):
     """Сериализатор для работы c произведении."""
 
-    genre = serializers.SlugRelatedField(
+    genre = PrefetchedSlugRelatedField(
         slug_field='slug',
         many=True,
         allow_empty=False,
         queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
+    category = PrefetchedSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
@@ -93,13 +156,39 @@ class TitleSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         response = super().to_representation(instance)
-        response['genre'] = GenreSerializer(many=True).to_representation(
-            instance.genre)
-        response['category'] = CategorySerializer().to_representation(
-            instance.category)
+        if 'genre' in response:
+            # Порядок как у списка (api.rows.get_title_genres): сортировка
+            # в Python, а не в collation базы.
+            response['genre'] = GenreSerializer(
+                many=True).to_representation(sorted(
+                    instance.genre.all(),
+                    key=attrgetter('name', 'slug')
+                ))
+        if 'category' in response:
+            response['category'] = CategorySerializer().to_representation(
+                instance.category)
         return response
 
 
+class TitleStatsSerializer(serializers.ModelSerializer):
+    """Сериализатор распределения оценок произведения."""
+
+    rating = serializers.IntegerField(
+        read_only=True, default=DEFAULT_TITLE_RATING)
+    scores = serializers.SerializerMethodField()
+
+    class Meta:
+        fields = ('id', 'rating', 'reviews_count', 'scores')
+        model = Title
+
+    def get_scores(self, title):
+        counts = {row.score: row.count for row in title.score_counts.all()}
+        return {
+            str(score): counts.get(score, 0)
+            for score in range(MIN_SCORE_VALUE, MAX_SCORE_VALUE + 1)
+        }
+
+
 class RegistrationSerializer(serializers.Serializer):
     """Сериализатор для регистрации."""
 
@@ -111,9 +200,7 @@ class RegistrationSerializer(serializers.Serializer):
         fields = ('username', 'email',)
 
     def validate_username(self, username):
-        if username == BAN_USERNAME:
-            raise serializers.ValidationError('Некорректное имя пользователя.')
-        return username
+        return validate_username(username)
 
     def validate(self, attrs):
         user_with_username = User.objects.filter(
@@ -130,11 +217,10 @@ class RegistrationSerializer(serializers.Serializer):
     def create(self, validated_data):
         user, _ = User.objects.get_or_create(**validated_data)
         confirmation_code = default_token_generator.make_token(user)
-        send_mail(
+        enqueue_email(
+            recipient=user.email,
             subject='Code of api_yamdb',
             message=confirmation_code,
-            from_email=settings.FROM_EMAIL,
-            recipient_list=[user.email],
         )
         return user
 
@@ -155,7 +241,8 @@ class TokenSerializer(serializers.Serializer):
         return attrs
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsSerializerMixin,
+                     serializers.ModelSerializer):
     """Сериализатор для работы с пользователями."""
 
     role = serializers.ChoiceField(choices=ROLES, default=DEFAULT_ROLE)
@@ -165,6 +252,9 @@ class UserSerializer(serializers.ModelSerializer):
                   'last_name', 'bio', 'role')
         model = User
 
+    def validate_username(self, username):
+        return validate_username(username)
+
 
 class UserMeSerializer(UserSerializer):
     """Сериализатор для получения и редактирования своей учетной записи."""
@@ -177,7 +267,8 @@ class UserMeSerializer(UserSerializer):
         model = User
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализатор для работы с комментариями."""
 
     author = serializers.SlugRelatedField(
@@ -0,0 +1,83 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from api.cache import (CATEGORIES_NAMESPACE, GENRES_NAMESPACE,
+                       TITLES_NAMESPACE, USERS_NAMESPACE, get_bulk_namespace,
+                       invalidate_namespaces)
+from reviews.models import Category, Genre, Review, Title, TitleGenre, User
+from reviews.signals import bulk_loaded
+
+TAG_NAMESPACES = {
+    Category: CATEGORIES_NAMESPACE,
+    Genre: GENRES_NAMESPACE,
+}
+
+
+def invalidate_titles(*title_ids):
+    invalidate_namespaces(
+        TITLES_NAMESPACE,
+        *(f'{TITLES_NAMESPACE}-{title_id}' for title_id in title_ids)
+    )
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    invalidate_titles(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review_title(sender, instance, **kwargs):
+    invalidate_titles(instance.title_id)
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def invalidate_title_genre(sender, instance, **kwargs):
+    invalidate_titles(instance.title_id)
+
+
+@receiver(m2m_changed, sender=TitleGenre)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_titles(instance.pk)
+    elif pk_set:
+        invalidate_titles(*pk_set)
+    else:
+        invalidate_titles(*instance.titles.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def invalidate_tag(sender, instance, **kwargs):
+    invalidate_namespaces(TAG_NAMESPACES[sender])
+    invalidate_titles(*instance.titles.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user(sender, instance, created, update_fields, **kwargs):
+    # Имя автора выводится в лентах отзывов и комментариев.
+    if created or update_fields and 'username' not in update_fields:
+        return
+    invalidate_namespaces(USERS_NAMESPACE)
+
+
+@receiver(bulk_loaded)
+def invalidate_bulk_loaded(sender, **kwargs):
+    if sender is User:
+        invalidate_namespaces(USERS_NAMESPACE)
+        return
+    if sender in TAG_NAMESPACES:
+        invalidate_namespaces(TAG_NAMESPACES[sender])
+    elif sender not in (Title, TitleGenre, Review):
+        return
+    invalidate_namespaces(
+        TITLES_NAMESPACE, get_bulk_namespace(TITLES_NAMESPACE)
+    )
@@ -1,8 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import CreateAPIView, RetrieveUpdateAPIView
 from rest_framework.permissions import (AllowAny, IsAdminUser,
@@ -11,10 +12,23 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 
 from api import serializers
-from api.filters import TitleFilter
-from api.mixins import MixinTagViewSet
+from api.bulk import BulkTitleMixin
+from api.cache import (CATEGORIES_NAMESPACE, GENRES_NAMESPACE,
+                       TITLES_NAMESPACE, USERS_NAMESPACE, CachedReadMixin,
+                       NamespaceEtagMixin)
+from api.conditional import ConditionalGetMixin
+from api.export import TitleExportMixin
+from api.filters import TitleFilter, UsernamePrefixFilter
+from api.mixins import (IdListMixin, MixinTagViewSet, NestedParentMixin,
+                        SparseFieldsMixin)
+from api.pagination import FeedPagination
 from api.permissions import IsAuthorOrStaff, IsRoleAdmin, IsRoleAdminOrReadOnly
+from api.renderers import StreamingListMixin
+from api.rows import (CommentRowSerializer, ReviewRowSerializer, RowListMixin,
+                      TitleRowSerializer)
+from reviews.constants import TITLE_RATING_FIELDS, USERNAME_AUTOCOMPLETE_LIMIT
 from reviews.models import Category, Genre, Review, Title
+from reviews.search import filter_usernames_by_prefix
 
 User = get_user_model()
 
@@ -61,75 +75,117 @@ class UserMeView(RetrieveUpdateAPIView):
         return self.request.user
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с пользователями."""
 
     queryset = User.objects.all()
     serializer_class = serializers.UserSerializer
     permission_classes = (IsRoleAdmin | IsAdminUser,)
-    filter_backends = (SearchFilter,)
+    filter_backends = (SearchFilter, UsernamePrefixFilter)
     lookup_field = 'username'
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request):
+        """Первые имена пользователей, начинающиеся с `?prefix=`."""
+        prefix = request.query_params.get('prefix', '')
+        if not prefix:
+            raise ValidationError({
+                'prefix': ['Укажите начало имени пользователя.']
+            })
+        usernames = filter_usernames_by_prefix(
+            self.get_queryset(), prefix
+        ).values_list('username', flat=True)
+        return Response(list(usernames[:USERNAME_AUTOCOMPLETE_LIMIT]))
+
+
+class ReviewViewSet(NestedParentMixin, NamespaceEtagMixin, ConditionalGetMixin,
+                    SparseFieldsMixin, RowListMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с отзывами."""
     serializer_class = serializers.ReviewSerializer
+    row_serializer_class = ReviewRowSerializer
     permission_classes = (IsAuthorOrStaff, IsAuthenticatedOrReadOnly)
+    pagination_class = FeedPagination
+    etag_fields = ('pk', 'pub_date', 'edit_date', 'author__username')
+    etag_namespaces = (USERS_NAMESPACE,)
+    sparse_always_fields = ('pub_date',)
     http_method_names = ['get', 'post', 'patch', 'delete']
-
-    def get_title_obj(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        return title
+    parent_model = Title
+    parent_lookups = {'pk': 'title_id'}
 
     def get_queryset(self):
-        title = self.get_title_obj()
-        return title.reviews.all()
+        title = self.get_parent()
+        return title.reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title = self.get_title_obj()
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.get_parent())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedParentMixin, NamespaceEtagMixin,
+                     ConditionalGetMixin, SparseFieldsMixin, RowListMixin,
+                     viewsets.ModelViewSet):
     """Вьюсет для работы с комментариями."""
 
     serializer_class = serializers.CommentSerializer
+    row_serializer_class = CommentRowSerializer
     permission_classes = (IsAuthorOrStaff, IsAuthenticatedOrReadOnly)
+    pagination_class = FeedPagination
+    etag_fields = ('pk', 'pub_date', 'edit_date', 'author__username')
+    etag_namespaces = (USERS_NAMESPACE,)
+    sparse_always_fields = ('pub_date',)
     http_method_names = ['get', 'post', 'patch', 'delete']
-
-    def get_review_obj(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        review_id = self.kwargs.get('review_id')
-        return get_object_or_404(
-            Review.objects.filter(title=title), pk=review_id)
+    parent_model = Review
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
 
     def get_queryset(self):
-        review = self.get_review_obj()
-        return review.comments.all()
+        review = self.get_parent()
+        return review.comments.select_related('author')
 
     def perform_create(self, serializer):
-        review = self.get_review_obj()
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(StreamingListMixin, CachedReadMixin, ConditionalGetMixin,
+                   BulkTitleMixin, TitleExportMixin, IdListMixin,
+                   SparseFieldsMixin, RowListMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с произведениями."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('-year')
-
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('-year')
     serializer_class = serializers.TitleSerializer
+    row_serializer_class = TitleRowSerializer
     permission_classes = (IsRoleAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     ordering_fields = ('category', 'genre', 'name', 'year')
     ordering = ('-year',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_namespace = TITLES_NAMESPACE
+    conditional_actions = ('retrieve',)
+    etag_fields = ('pk', 'edit_date', 'score_sum', 'reviews_count',
+                   'category__name', 'category__slug',
+                   'genre__name', 'genre__slug')
+    sparse_field_sources = {'rating': TITLE_RATING_FIELDS}
+
+    def get_queryset(self):
+        if self.action == 'stats':
+            return Title.objects.only(
+                'pk', *TITLE_RATING_FIELDS
+            ).prefetch_related('score_counts')
+        return super().get_queryset()
+
+    @action(detail=True, methods=['get'], url_path='stats')
+    def stats(self, request, *args, **kwargs):
+        """Распределение оценок: число отзывов на каждую оценку."""
+        return self.get_cached_response(
+            self.get_stats_response, request, *args, **kwargs)
+
+    def get_stats_response(self, request, *args, **kwargs):
+        return Response(
+            serializers.TitleStatsSerializer(self.get_object()).data
+        )
 
 
 class CategoryViewSet(MixinTagViewSet):
@@ -137,6 +193,7 @@ class CategoryViewSet(MixinTagViewSet):
 
     queryset = Category.objects.all()
     serializer_class = serializers.CategorySerializer
+    cache_namespace = CATEGORIES_NAMESPACE
 
 
 class GenreViewSet(MixinTagViewSet):
@@ -144,3 +201,4 @@ class GenreViewSet(MixinTagViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = serializers.GenreSerializer
+    cache_namespace = GENRES_NAMESPACE
@@ -63,6 +63,16 @@ DATABASES = {
     }
 }
 
+# Кеш общий для всех процессов: версии пространств имен сбрасываются и из
+# management-команд (load_from_csv, rebuild_ratings).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'TIMEOUT': 300,
+    }
+}
+
 AUTH_USER_MODEL = 'reviews.User'
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -88,6 +98,15 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 }
@@ -119,3 +138,7 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 FROM_EMAIL = 'from@example.com'
+
+# Письма копятся в очереди и отправляются командой send_emails.
+# В режиме EAGER очередь отправляется сразу после коммита запроса.
+EMAIL_OUTBOX_EAGER = False
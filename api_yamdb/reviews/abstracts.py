@@ -28,6 +28,10 @@ class AbstractCommentReviewModel(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    edit_date = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
 
     class Meta:
         abstract = True
@@ -4,7 +4,8 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 from reviews.constants import (ADDITIONAL_EDITABLE_USER_FIELDS,
                                ADDITIONAL_USER_FIELDS)
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (Category, Comment, Genre, OutgoingEmail, Review,
+                            Title)
 
 User = get_user_model()
 
@@ -90,6 +91,20 @@ class CommentAdmin(admin.ModelAdmin):
     list_display_links = ('author',)
 
 
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'created_at',
+        'sent_at',
+        'attempts'
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+    readonly_fields = ('created_at', 'sent_at', 'attempts', 'last_error')
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     model = User
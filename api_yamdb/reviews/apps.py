@@ -5,3 +5,6 @@ class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
     verbose_name = "Отзывы к произведениям"
+
+    def ready(self):
+        import reviews.signals  # noqa: F401
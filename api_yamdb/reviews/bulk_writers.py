@@ -0,0 +1,192 @@
+import csv
+from io import StringIO
+
+from django.core.management.color import no_style
+from django.db import connection
+from django.utils import timezone
+
+COPY_NULL = r'\N'
+TEXT_FIELD_TYPES = frozenset((
+    'CharField', 'EmailField', 'SlugField', 'TextField'
+))
+INTEGER_FIELD_TYPES = frozenset((
+    'AutoField', 'BigAutoField', 'BigIntegerField', 'IntegerField',
+    'PositiveIntegerField', 'PositiveSmallIntegerField', 'SmallIntegerField'
+))
+
+
+def to_int(value):
+    return None if value in ('', None) else int(value)
+
+
+def empty_to_none(value):
+    """Пустое поле csv в nullable-колонке - это NULL, а не ''."""
+    return None if value == '' else value
+
+
+def get_db_converter(field):
+    """Возвращает самое дешевое приведение значения csv к типу базы.
+
+    Строки и целые числа не гоняются через to_python/get_db_prep_save.
+    """
+    internal_type = field.get_internal_type()
+    if field.is_relation:
+        internal_type = field.target_field.get_internal_type()
+    if internal_type in TEXT_FIELD_TYPES:
+        return empty_to_none if field.null else None
+    if internal_type in INTEGER_FIELD_TYPES:
+        return to_int
+
+    def convert(value):
+        if value == '' and field.null:
+            return None
+        return field.get_db_prep_save(field.to_python(value), connection)
+    return convert
+
+
+def is_auto_date(field):
+    return (getattr(field, 'auto_now', False)
+            or getattr(field, 'auto_now_add', False))
+
+
+class OrmWriter:
+    """Пишет строки csv в таблицу модели через bulk_create.
+
+    bulk_create вызывает pre_save, и auto_now/auto_now_add затирают даты
+    из файла, поэтому такие колонки после вставки восстанавливаются
+    bulk_update по id (id нужен в файле или, как в PostgreSQL, должен
+    вернуться из INSERT). Колонки, которых нет в файле, заполняются
+    значениями по умолчанию.
+    """
+
+    def __init__(self, model_class, columns):
+        self.model_class = model_class
+        self.columns = columns
+        meta = model_class._meta
+        self.fields = [meta.get_field(column) for column in columns]
+        self.missing_fields = [
+            field for field in meta.concrete_fields
+            if field.attname not in columns and not field.primary_key
+        ]
+        self.auto_date_fields = [
+            field for field in self.fields if is_auto_date(field)
+        ]
+
+    def get_defaults(self):
+        now = timezone.now()
+        return [
+            now if is_auto_date(field) else field.get_default()
+            for field in self.missing_fields
+        ]
+
+    def write(self, rows):
+        defaults = {
+            field.attname: value
+            for field, value in zip(self.missing_fields, self.get_defaults())
+        }
+        objs = [
+            self.model_class(**{
+                field.attname: empty_to_none(value) if field.null else value
+                for field, value in zip(self.fields, row)
+            }, **defaults)
+            for row in rows
+        ]
+        dates = [
+            [getattr(obj, field.attname) for field in self.auto_date_fields]
+            for obj in objs
+        ]
+        manager = self.model_class._base_manager
+        manager.bulk_create(objs)
+        if not self.auto_date_fields:
+            return
+        restored = []
+        for obj, values in zip(objs, dates):
+            if obj.pk is None:
+                continue
+            for field, value in zip(self.auto_date_fields, values):
+                setattr(obj, field.attname, value)
+            restored.append(obj)
+        manager.bulk_update(
+            restored, [field.name for field in self.auto_date_fields]
+        )
+
+    def finish(self):
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(), [self.model_class]
+        )
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+
+
+class NativeWriter(OrmWriter):
+    """Пишет строки csv в таблицу модели в обход ORM.
+
+    Значения приводятся к типам базы через поля модели.
+    """
+
+    def __init__(self, model_class, columns):
+        super().__init__(model_class, columns)
+        self.db_columns = [
+            field.column for field in self.fields + self.missing_fields
+        ]
+
+    def prepare_rows(self, rows):
+        converters = list(map(get_db_converter, self.fields))
+        defaults = [
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(self.missing_fields, self.get_defaults())
+        ]
+        for row in rows:
+            yield [
+                value if convert is None else convert(value)
+                for convert, value in zip(converters, row)
+            ] + defaults
+
+
+class SQLiteWriter(NativeWriter):
+    """executemany одним подготовленным INSERT на пачку строк."""
+
+    def write(self, rows):
+        quote_name = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote_name(self.model_class._meta.db_table),
+            ', '.join(map(quote_name, self.db_columns)),
+            ', '.join(['%s'] * len(self.db_columns))
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, self.prepare_rows(rows))
+
+
+class PostgreSQLWriter(NativeWriter):
+    """COPY FROM STDIN пачки строк в формате csv."""
+
+    def write(self, rows):
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        for row in self.prepare_rows(rows):
+            writer.writerow(
+                [COPY_NULL if value is None else value for value in row]
+            )
+        buffer.seek(0)
+        quote_name = connection.ops.quote_name
+        sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '{}')".format(
+            quote_name(self.model_class._meta.db_table),
+            ', '.join(map(quote_name, self.db_columns)),
+            COPY_NULL
+        )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+
+
+NATIVE_WRITERS = {
+    'sqlite': SQLiteWriter,
+    'postgresql': PostgreSQLWriter,
+}
+
+
+def get_writer_class(orm=False):
+    """Возвращает самый быстрый способ записи для текущей базы."""
+    if orm:
+        return OrmWriter
+    return NATIVE_WRITERS.get(connection.vendor, OrmWriter)
@@ -14,7 +14,27 @@ MAX_SCORE_VALUE: Final[int] = 10
 MIN_SCORE_VALUE: Final[int] = 1
 USERNAME_MAX_LENGTH: Final[int] = 150
 DEFAULT_TITLE_RATING: Final[int] = 0
-BAN_USERNAME: Final[str] = 'me'
+# Совпадают с путями /users/me/ и /users/autocomplete/.
+BANNED_USERNAMES: Final[tuple] = ('me', 'autocomplete')
+TITLE_RATING_FIELDS: Final[tuple] = ('score_sum', 'reviews_count')
+SUBJECT_MAX_LENGTH: Final[int] = 256
+OUTBOX_BATCH_SIZE: Final[int] = 100
+OUTBOX_MAX_ATTEMPTS: Final[int] = 5
+OUTBOX_LOCK_SECONDS: Final[int] = 300
+IMPORT_BATCH_SIZE: Final[int] = 1000
+IMPORT_REPORT_EVERY: Final[int] = 10000
+DUMP_CHUNK_SIZE: Final[int] = 2000
+BULK_MAX_ITEMS: Final[int] = 1000
+# Совпадают с путями /genres/bulk/ и /categories/bulk/.
+RESERVED_SLUGS: Final[tuple] = ('bulk',)
+BULK_BATCH_SIZE: Final[int] = 500
+IDS_MAX_COUNT: Final[int] = 100
+JSON_STREAM_MIN_ITEMS: Final[int] = 500
+JSON_STREAM_CHUNK_SIZE: Final[int] = 100
+EXPORT_CHUNK_SIZE: Final[int] = 2000
+TITLE_SEARCH_TABLE: Final[str] = 'reviews_title_search'
+SEARCH_CONFIG: Final[str] = 'russian'
+USERNAME_AUTOCOMPLETE_LIMIT: Final[int] = 10
 
 
 ROLES = (
@@ -0,0 +1,62 @@
+import gzip
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+User = get_user_model()
+
+CSV_SUFFIX = '.csv'
+GZIP_SUFFIX = '.gz'
+# При чтении пропускается BOM, если файл сохранен из Excel.
+READ_ENCODING = 'utf-8-sig'
+WRITE_ENCODING = 'utf-8'
+
+# Колонки users.csv из исходных данных проекта.
+USER_SAMPLE_COLUMNS = (
+    'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+)
+# Выгрузка пользователей полная (пароль, права, даты), поэтому за
+# колонками из исходных данных идут все остальные поля модели.
+USER_COLUMNS = USER_SAMPLE_COLUMNS + tuple(
+    field.name for field in User._meta.concrete_fields
+    if field.name not in USER_SAMPLE_COLUMNS
+)
+
+# Файлы и колонки в том виде, в каком их читает load_from_csv.
+CSV_LAYOUT = (
+    ('users', User, USER_COLUMNS),
+    ('category', Category, ('id', 'name', 'slug')),
+    ('genre', Genre, ('id', 'name', 'slug')),
+    ('titles', Title, ('id', 'name', 'year', 'category', 'description')),
+    ('genre_title', TitleGenre, ('id', 'title_id', 'genre_id')),
+    ('review', Review,
+     ('id', 'title_id', 'text', 'author', 'score', 'pub_date')),
+    ('comments', Comment, ('id', 'review_id', 'text', 'author', 'pub_date')),
+)
+
+
+def find_csv_files(directory):
+    """Файлы csv в директории, в том числе сжатые gzip (`.csv.gz`)."""
+    directory = Path(directory)
+    return sorted([
+        *directory.glob(f'*{CSV_SUFFIX}'),
+        *directory.glob(f'*{CSV_SUFFIX}{GZIP_SUFFIX}'),
+    ])
+
+
+def get_csv_stem(path):
+    """Имя файла без `.csv` и `.csv.gz`."""
+    name = Path(path).name
+    if name.endswith(GZIP_SUFFIX):
+        name = name[:-len(GZIP_SUFFIX)]
+    return name[:-len(CSV_SUFFIX)]
+
+
+def open_csv(path, mode='r'):
+    """Открывает csv как текст, сжатый gzip - если имя кончается на .gz."""
+    encoding = READ_ENCODING if mode == 'r' else WRITE_ENCODING
+    if Path(path).name.endswith(GZIP_SUFFIX):
+        return gzip.open(path, f'{mode}t', encoding=encoding, newline='')
+    return open(path, mode, encoding=encoding, newline='')
@@ -0,0 +1,100 @@
+import csv
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from reviews.constants import DUMP_CHUNK_SIZE
+from reviews.csv_files import CSV_LAYOUT, CSV_SUFFIX, GZIP_SUFFIX, open_csv
+
+
+def to_csv_value(value):
+    """Приводит значение базы к виду, который читает load_from_csv."""
+    if isinstance(value, datetime.datetime):
+        value = value.astimezone(datetime.timezone.utc).isoformat()
+        return value.replace('+00:00', 'Z')
+    return value
+
+
+def dump_table(model_class, header, path, chunk_size):
+    """Пишет таблицу модели в csv, читая ее по id порциями."""
+    meta = model_class._meta
+    columns = [meta.get_field(name).attname for name in header]
+    rows = model_class.objects.order_by('pk').values_list(
+        *columns
+    ).iterator(chunk_size=chunk_size)
+    started = time.monotonic()
+    dumped = 0
+    with open_csv(path, 'w') as file:
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow([to_csv_value(value) for value in row])
+            dumped += 1
+    return dumped, time.monotonic() - started
+
+
+def dump_table_in_thread(*args):
+    """dump_table для пула потоков: у каждого потока свое соединение."""
+    try:
+        return dump_table(*args)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = ('Выгружает базу в csv-файлы в формате load_from_csv. '
+            'Укажите путь к папке для файлов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path_to_dir', type=str)
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы gzip (.csv.gz), load_from_csv читает их.'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help=('Количество таблиц, выгружаемых одновременно. Таблицы '
+                  'читаются в разных транзакциях.')
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DUMP_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(options['path_to_dir'])
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = CSV_SUFFIX + (GZIP_SUFFIX if options['gzip'] else '')
+        tasks = [
+            (model_class, header, directory / f'{name}{suffix}',
+             options['chunk_size'])
+            for name, model_class, header in CSV_LAYOUT
+        ]
+        if options['jobs'] > 1:
+            with ThreadPoolExecutor(max_workers=options['jobs']) as executor:
+                futures = [
+                    (task, executor.submit(dump_table_in_thread, *task))
+                    for task in tasks
+                ]
+                for task, future in futures:
+                    self._report(task, *future.result())
+        else:
+            for task in tasks:
+                self._report(task, *dump_table(*task))
+
+    def _report(self, task, dumped, elapsed):
+        model_class, _, path, _ = task
+        speed = dumped / elapsed if elapsed else dumped
+        self.stdout.write(
+            f'{model_class.__name__}: выгружено {dumped} строк в {path.name} '
+            f'({speed:.0f} строк/с)'
+        )
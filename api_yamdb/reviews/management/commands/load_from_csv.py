@@ -1,15 +1,65 @@
 import csv
-import glob
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from graphlib import TopologicalSorter
+from itertools import islice
+from pathlib import Path
 
+import django
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.db.utils import IntegrityError
 
+from reviews.bulk_writers import get_writer_class
+from reviews.constants import IMPORT_BATCH_SIZE, IMPORT_REPORT_EVERY
+from reviews.csv_files import find_csv_files, get_csv_stem, open_csv
 from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+from reviews.signals import bulk_loaded
 
 User = get_user_model()
 
 
+def get_columns(model_class, header):
+    """Сопоставляет заголовки csv с колонками модели один раз на файл.
+
+    Внешние ключи (`category`, `author`) пишутся сразу в `<поле>_id`.
+    """
+    return [model_class._meta.get_field(name).attname for name in header]
+
+
+def parse_csv_file(path, model_label):
+    """Читает и валидирует csv-файл в отдельном процессе.
+
+    Возвращает колонки модели и строки, приведенные к python-типам,
+    чтобы основному процессу оставалось только записать их в базу.
+    """
+    if not apps.ready:
+        django.setup()
+    model_class = apps.get_model(model_label)
+    with open_csv(path) as file:
+        reader = csv.reader(file)
+        columns = get_columns(model_class, next(reader))
+        fields = [model_class._meta.get_field(name) for name in columns]
+        rows = []
+        for line_number, row in enumerate(reader, start=2):
+            try:
+                rows.append(tuple(
+                    None if value == '' and field.null
+                    else field.to_python(value)
+                    for field, value in zip(fields, row)
+                ))
+            except ValidationError as error:
+                raise CommandError(
+                    f'{Path(path).name}, строка {line_number}: '
+                    f'{" ".join(error.messages)}'
+                )
+    return columns, rows
+
+
 class Command(BaseCommand):
     help = 'Укажите путь к папке с csv документами.'
     model_class_dict = {
@@ -26,46 +76,138 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('path_to_dir', type=str)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество строк, записываемых одной транзакцией.'
+        )
+        parser.add_argument(
+            '--report-every',
+            type=int,
+            default=IMPORT_REPORT_EVERY,
+            help='Как часто (в строках) выводить прогресс загрузки.'
+        )
+        parser.add_argument(
+            '--orm',
+            action='store_true',
+            help=('Писать через bulk_create даже если для базы есть быстрый '
+                  'путь (executemany в SQLite, COPY в PostgreSQL).')
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help=('Количество процессов для разбора файлов. Разобранные '
+                  'файлы целиком держатся в памяти до записи.')
+        )
 
     def handle(self, *args, **options):
-        csv_list = glob.glob(f'{options["path_to_dir"]}\\*.csv')
-        pointer = 0
-        if not csv_list:
+        csv_files = find_csv_files(options['path_to_dir'])
+        if not csv_files:
             raise CommandError('В директории нет .csv файлов')
-        while csv_list or pointer > len(csv_list):
-            csv_file = csv_list[pointer]
-            with open(csv_file, encoding='utf-8-sig') as file:
-                file_name = csv_file.split('\\')[-1]
-                is_many_to_many, model_key = (
-                    self._get_model_key_from_filename(file_name)
+        plan = self._get_import_plan(csv_files)
+        self.writer_class = get_writer_class(orm=options['orm'])
+        try:
+            if options['jobs'] > 1:
+                self._load_parallel(plan, options)
+            else:
+                self._load_sequential(plan, options)
+        except IntegrityError as error:
+            raise CommandError(f'Не удалось загрузить данные: {error}')
+
+    def _load_sequential(self, plan, options):
+        for model_class, csv_file in plan:
+            self._check_table_is_empty(model_class)
+            with open_csv(csv_file) as file:
+                self._write_to_database(
+                    file, model_class,
+                    options['batch_size'], options['report_every']
+                )
+
+    def _load_parallel(self, plan, options):
+        """Разбирает файлы в пуле процессов, пишет в базу по плану.
+
+        Одновременно в разборе не больше `jobs` файлов: независимые таблицы
+        парсятся параллельно, пока основной процесс пишет предыдущие.
+        """
+        plan = iter(plan)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=options['jobs']) as executor:
+
+            def submit(model_class, csv_file):
+                pending.append((model_class, executor.submit(
+                    parse_csv_file, str(csv_file), model_class._meta.label
+                )))
+
+            for model_class, csv_file in islice(plan, options['jobs']):
+                submit(model_class, csv_file)
+            while pending:
+                model_class, future = pending.popleft()
+                next_file = next(plan, None)
+                if next_file is not None:
+                    submit(*next_file)
+                columns, rows = future.result()
+                self._check_table_is_empty(model_class)
+                self._write_rows(
+                    iter(rows), columns, model_class,
+                    options['batch_size'], options['report_every']
                 )
-                if not model_key:
-                    self.stdout.write(
-                        f'Файл {file_name} не подходит ни к одной модели.',
-                        ending='\n'
-                    )
-                    csv_list.pop(pointer)
-                    continue
-                try:
-                    if is_many_to_many:
-                        model_class = self.many_to_many_class_dict[model_key]
-                    else:
-                        model_class = self.model_class_dict[model_key]
-                    if model_class.objects.all().count() != 0:
-                        raise CommandError(
-                            (f'Таблица {model_class.__name__} не пуста. '
-                             'Удалите и пересоздайте базу данных при помощи '
-                             'команды migrate')
-                        )
-                    self._write_to_database(file, model_class)
-                    csv_list.pop(pointer)
-                except IntegrityError:
-                    csv_list.append(csv_list.pop(pointer))
+
+    def _check_table_is_empty(self, model_class):
+        if model_class.objects.exists():
+            raise CommandError(
+                (f'Таблица {model_class.__name__} не пуста. '
+                 'Удалите и пересоздайте базу данных при помощи '
+                 'команды migrate')
+            )
+
+    def _get_import_plan(self, csv_files):
+        """Сопоставляет файлы моделям и упорядочивает их по внешним ключам.
+
+        Каждый файл загружается ровно один раз: таблица идет после всех
+        таблиц, на которые она ссылается.
+        """
+        files_by_model = {}
+        for csv_file in csv_files:
+            is_many_to_many, model_key = (
+                self._get_model_key_from_filename(get_csv_stem(csv_file))
+            )
+            if not model_key:
+                self.stdout.write(
+                    f'Файл {csv_file.name} не подходит ни к одной модели.'
+                )
+                continue
+            if is_many_to_many:
+                model_class = self.many_to_many_class_dict[model_key]
+            else:
+                model_class = self.model_class_dict[model_key]
+            if model_class in files_by_model:
+                raise CommandError(
+                    f'Для модели {model_class.__name__} найдено несколько '
+                    f'файлов: {files_by_model[model_class].name}, '
+                    f'{csv_file.name}'
+                )
+            files_by_model[model_class] = csv_file
+        graph = {
+            model_class: {
+                field.related_model
+                for field in model_class._meta.concrete_fields
+                if field.many_to_one
+                and field.related_model in files_by_model
+                and field.related_model is not model_class
+            }
+            for model_class in files_by_model
+        }
+        return [
+            (model_class, files_by_model[model_class])
+            for model_class in TopologicalSorter(graph).static_order()
+        ]
 
     def _get_model_key_from_filename(self, file_name):
         for model_name in self.many_to_many_class_dict.keys():
             if '_' in file_name:
-                file_name = file_name[:-4].split('_')
+                file_name = file_name.split('_')
                 if (
                     model_name[0] in file_name
                     and model_name[1] in file_name
@@ -76,25 +218,36 @@ class Command(BaseCommand):
                 return False, model_name
         return None, None
 
-    def _write_to_database(self, file, model_class):
+    def _write_to_database(self, file, model_class, batch_size,
+                           report_every):
         reader = csv.reader(file)
-        for row in reader:
-            if row[0] == 'id':
-                kwarg = {}
-                keys = []
-                for i in row:
-                    if (
-                        i in [*self.model_class_dict.keys(), 'author']
-                        and '_id' not in i
-                    ):
-                        i = i + '_id'
-                    keys.append(i)
-                kwarg = kwarg.fromkeys(keys)
-                continue
-            for i in range(len(row)):
-                kwarg[list(kwarg.keys())[i]] = row[i]
-            _, created = model_class.objects.get_or_create(**kwarg)
-            self.stdout.write(
-                f'Создан экземппляр модели {model_class.__name__}',
-                ending='\n'
-            )
+        columns = get_columns(model_class, next(reader))
+        self._write_rows(
+            reader, columns, model_class, batch_size, report_every
+        )
+
+    def _write_rows(self, rows, columns, model_class, batch_size,
+                    report_every):
+        writer = self.writer_class(model_class, columns)
+        loaded = 0
+        started = time.monotonic()
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                writer.write(batch)
+            previous_loaded, loaded = loaded, loaded + len(batch)
+            if loaded // report_every > previous_loaded // report_every:
+                self._report_progress(model_class, loaded, started)
+        writer.finish()
+        self._report_progress(model_class, loaded, started)
+        bulk_loaded.send(sender=model_class)
+
+    def _report_progress(self, model_class, loaded, started):
+        elapsed = time.monotonic() - started
+        speed = loaded / elapsed if elapsed else loaded
+        self.stdout.write(
+            f'{model_class.__name__}: загружено {loaded} строк '
+            f'({speed:.0f} строк/с)'
+        )
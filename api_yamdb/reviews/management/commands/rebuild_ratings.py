@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.models import Title
+from reviews.ratings import (get_drifted_score_title_ids, get_drifted_titles,
+                             rebuild_drifted_ratings)
+from reviews.signals import bulk_loaded
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохраненные рейтинги произведений по отзывам. '
+            'С флагом --check только проверяет расхождения.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только вывести произведения с расхождениями.'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['check']:
+                drifted = list(get_drifted_titles())
+                drifted_score_ids = get_drifted_score_title_ids()
+            else:
+                drifted, drifted_score_ids = rebuild_drifted_ratings()
+        for title in drifted:
+            self.stdout.write(
+                f'{title.pk} "{title}": '
+                f'сумма {title.score_sum} -> {title.actual_score_sum}, '
+                f'отзывов {title.reviews_count} -> '
+                f'{title.actual_reviews_count}'
+            )
+        for title_id in drifted_score_ids:
+            self.stdout.write(
+                f'{title_id}: распределение оценок разошлось с отзывами'
+            )
+        drifted_count = len(
+            {title.pk for title in drifted} | set(drifted_score_ids)
+        )
+        if not options['check']:
+            if drifted_count:
+                # Рейтинги пересчитаны через update() без post_save.
+                bulk_loaded.send(sender=Title)
+            self.stdout.write(f'Пересчитано произведений: {drifted_count}.')
+        elif drifted_count:
+            raise CommandError(f'Расхождения у {drifted_count} произведений.')
+        else:
+            self.stdout.write('Расхождений нет.')
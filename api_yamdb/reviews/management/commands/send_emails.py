@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.constants import OUTBOX_BATCH_SIZE
+from reviews.outbox import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help='Количество писем в одной пачке.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а опрашивать очередь с интервалом.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между опросами пустой очереди, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent_count = send_queued_emails(options['batch_size'])
+            if sent_count:
+                self.stdout.write(f'Отправлено писем: {sent_count}.')
+            if sent_count < options['batch_size']:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
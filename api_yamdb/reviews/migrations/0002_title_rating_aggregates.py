@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 18:43
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    titles = Title.objects.annotate(
+        actual_score_sum=Sum('reviews__score'),
+        actual_reviews_count=Count('reviews')
+    ).filter(actual_reviews_count__gt=0)
+    for title in titles.iterator():
+        title.score_sum = title.actual_score_sum
+        title.reviews_count = title.actual_reviews_count
+        title.save(update_fields=('score_sum', 'reviews_count'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_edit_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('subject', models.CharField(max_length=256, verbose_name='Тема')),
+                ('message', models.TextField(verbose_name='Текст письма')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('sent_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Дата отправки')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Занято отправкой до')),
+            ],
+            options={
+                'verbose_name': 'исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ('created_at',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='outgoingemail',
+            constraint=models.UniqueConstraint(condition=models.Q(sent_at__isnull=True), fields=('recipient', 'subject'), name='unique_pending_email'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+from django.db import migrations
+
+SEARCH_CONFIG = 'russian'
+
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE reviews_title_search USING fts5(
+        name, description,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    INSERT INTO reviews_title_search (rowid, name, description)
+    SELECT id, name, description FROM reviews_title
+    """,
+    """
+    CREATE TRIGGER reviews_title_search_insert
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO reviews_title_search (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_search_update
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        UPDATE reviews_title_search
+        SET name = new.name, description = new.description
+        WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_search_delete
+    AFTER DELETE ON reviews_title BEGIN
+        DELETE FROM reviews_title_search WHERE rowid = old.id;
+    END
+    """,
+)
+SQLITE_BACKWARD = (
+    'DROP TRIGGER IF EXISTS reviews_title_search_insert',
+    'DROP TRIGGER IF EXISTS reviews_title_search_update',
+    'DROP TRIGGER IF EXISTS reviews_title_search_delete',
+    'DROP TABLE IF EXISTS reviews_title_search',
+)
+POSTGRESQL_FORWARD = (
+    f"""
+    ALTER TABLE reviews_title ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig,
+                              coalesce(name, '')), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig,
+                                 coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX reviews_title_search_vector_idx
+    ON reviews_title USING GIN (search_vector)
+    """,
+)
+POSTGRESQL_BACKWARD = (
+    'DROP INDEX IF EXISTS reviews_title_search_vector_idx',
+    'ALTER TABLE reviews_title DROP COLUMN IF EXISTS search_vector',
+)
+STATEMENTS = {
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+    'postgresql': (POSTGRESQL_FORWARD, POSTGRESQL_BACKWARD),
+}
+
+
+def run_statements(schema_editor, direction):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for statement in statements[direction]:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    run_statements(schema_editor, 0)
+
+
+def drop_search_index(apps, schema_editor):
+    run_statements(schema_editor, 1)
+
+
+class Migration(migrations.Migration):
+    """Полнотекстовый индекс по названию и описанию произведений.
+
+    SQLite: таблица FTS5, которую триггеры синхронизируют с reviews_title.
+    PostgreSQL: генерируемая колонка tsvector с GIN-индексом. На других
+    базах поиск работает через icontains. Индекс обновляется самой базой,
+    поэтому в синхронизации участвуют и массовые загрузки в обход ORM.
+    Миграции, которые в SQLite пересоздают reviews_title, удаляют триггеры:
+    их нужно создать заново в той же миграции.
+    """
+
+    dependencies = [
+        ('reviews', '0004_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+STATEMENTS = {
+    'sqlite': (
+        (
+            'CREATE INDEX reviews_user_username_lower_idx '
+            'ON reviews_user (LOWER(username))',
+        ),
+        (
+            'DROP INDEX IF EXISTS reviews_user_username_lower_idx',
+        ),
+    ),
+    'postgresql': (
+        (
+            'CREATE INDEX reviews_user_username_lower_idx '
+            'ON reviews_user ((LOWER(username) COLLATE "C"))',
+            'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            'CREATE INDEX reviews_user_username_trgm_idx '
+            'ON reviews_user USING GIN (UPPER(username::text) gin_trgm_ops)',
+        ),
+        (
+            'DROP INDEX IF EXISTS reviews_user_username_trgm_idx',
+            'DROP INDEX IF EXISTS reviews_user_username_lower_idx',
+        ),
+    ),
+}
+
+
+def run_statements(schema_editor, direction):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for statement in statements[direction]:
+        schema_editor.execute(statement)
+
+
+def create_username_indexes(apps, schema_editor):
+    run_statements(schema_editor, 0)
+
+
+def drop_username_indexes(apps, schema_editor):
+    run_statements(schema_editor, 1)
+
+
+class Migration(migrations.Migration):
+    """Индексы для поиска пользователей по username.
+
+    Индекс по LOWER(username) обслуживает поиск по префиксу диапазоном
+    (в PostgreSQL - с побайтовой сортировкой COLLATE "C", как в запросе).
+    В PostgreSQL триграммный GIN-индекс по UPPER(username::text) ускоряет
+    поиск подстроки через icontains, который строит ровно это выражение.
+    """
+
+    dependencies = [
+        ('reviews', '0005_title_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_username_indexes, drop_username_indexes),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-18 19:25
+
+from django.db import migrations, models
+from django.db.models import Min, Q
+import django.db.models.deletion
+
+
+def remove_orphans_and_duplicates(apps, schema_editor):
+    """Удаляет связи без произведения или жанра и повторы пар.
+
+    Из повторяющихся пар (title, genre) остается запись с меньшим id.
+    """
+    TitleGenre = apps.get_model('reviews', 'TitleGenre')
+    TitleGenre.objects.filter(
+        Q(title__isnull=True) | Q(genre__isnull=True)
+    ).delete()
+    kept_ids = TitleGenre.objects.order_by().values(
+        'title', 'genre'
+    ).annotate(kept_id=Min('id')).values('kept_id')
+    TitleGenre.objects.exclude(id__in=kept_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_feed_and_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_orphans_and_duplicates, migrations.RunPython.noop
+        ),
+        migrations.AlterModelOptions(
+            name='titlegenre',
+            options={},
+        ),
+        migrations.AlterField(
+            model_name='titlegenre',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.genre'),
+        ),
+        migrations.AlterField(
+            model_name='titlegenre',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.title'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlegenre',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_title_genre'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2 on 2026-10-18 19:27
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_title_scores(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleScore = apps.get_model('reviews', 'TitleScore')
+    rows = Review.objects.order_by().values('title_id', 'score').annotate(
+        total=Count('pk')
+    )
+    TitleScore.objects.bulk_create(
+        (TitleScore(title_id=row['title_id'], score=row['score'],
+                    count=row['total'])
+         for row in rows.iterator()),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_titlegenre_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'оценки произведения',
+                'verbose_name_plural': 'Оценки произведений',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlescore',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(fill_title_scores, migrations.RunPython.noop),
+    ]
@@ -3,13 +3,14 @@ from datetime import datetime
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from reviews.abstracts import AbstractCommentReviewModel, AbstractTagModel
 from reviews.constants import (DEFAULT_ROLE, EMAIL_MAX_LENGTH, MAX_SCORE_VALUE,
                                MIN_SCORE_VALUE, NAME_MAX_LENGTH,
                                PASSWORD_MAX_LENGTH, ROLE_ADMIN, ROLE_INDEX,
-                               ROLE_MODERATOR, ROLES, STR_OUTPUT_LIMIT)
+                               ROLE_MODERATOR, ROLES, STR_OUTPUT_LIMIT,
+                               SUBJECT_MAX_LENGTH, TITLE_RATING_FIELDS)
 
 
 def validate_year(value):
@@ -88,16 +89,52 @@ class Title(models.Model):
         null=True, on_delete=models.SET_NULL,
         verbose_name='Категория'
     )
+    edit_date = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         default_related_name = 'titles'
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('-year',)
+        indexes = [
+            models.Index(fields=('-year',), name='title_year_idx'),
+            models.Index(fields=('category', '-year'),
+                         name='title_category_year_idx'),
+        ]
 
     def __str__(self):
         return self.name[:STR_OUTPUT_LIMIT]
 
+    def save(self, *args, **kwargs):
+        # Агрегаты оценок меняются только F-выражениями при записи отзывов,
+        # сохранение произведения не должно затирать их устаревшими значениями.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in TITLE_RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        if not self.reviews_count:
+            return None
+        return self.score_sum / self.reviews_count
+
 
 class Review(AbstractCommentReviewModel):
     text = models.TextField(
@@ -123,6 +160,10 @@ class Review(AbstractCommentReviewModel):
                                     name='unique_review'
                                     )
         ]
+        indexes = [
+            models.Index(fields=('title', '-pub_date', '-id'),
+                         name='review_title_pub_date_idx'),
+        ]
 
     def __str__(self):
         return (
@@ -131,13 +172,69 @@ class Review(AbstractCommentReviewModel):
             f'оценка: "{self.score}".'
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Агрегаты произведения пересчитываются в post_save,
+        # поэтому запись отзыва и пересчет идут одной транзакцией.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._remember_loaded_values()
+
+    def _remember_loaded_values(self):
+        self._loaded_values = {
+            field: self.__dict__.get(field)
+            for field in ('score', 'title_id')
+        }
+
+
+class TitleScore(models.Model):
+    """Количество отзывов с одной оценкой у произведения.
+
+    Строки меняются вместе с отзывами в reviews.signals; строки с нулем
+    могут оставаться после удаления отзывов.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        db_index=False,
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField('Оценка')
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+
+    class Meta:
+        verbose_name = 'оценки произведения'
+        verbose_name_plural = 'Оценки произведений'
+        constraints = [
+            models.UniqueConstraint(fields=('title', 'score'),
+                                    name='unique_title_score')
+        ]
+
 
 class TitleGenre(models.Model):
-    title = models.ForeignKey(Title, null=True, on_delete=models.SET_NULL)
-    genre = models.ForeignKey(Genre, null=True, on_delete=models.SET_NULL)
+    # Отдельные индексы по полям не нужны: поиск по title идет по
+    # уникальному индексу (title, genre), по genre - по (genre, title).
+    title = models.ForeignKey(Title, on_delete=models.CASCADE,
+                              db_index=False)
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE,
+                              db_index=False)
 
     class Meta:
-        ordering = ('title',)
+        constraints = [
+            models.UniqueConstraint(fields=('title', 'genre'),
+                                    name='unique_title_genre')
+        ]
+        indexes = [
+            models.Index(fields=('genre', 'title'),
+                         name='titlegenre_genre_title_idx'),
+        ]
 
 
 class Comment(AbstractCommentReviewModel):
@@ -154,9 +251,51 @@ class Comment(AbstractCommentReviewModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(fields=('review', '-pub_date', '-id'),
+                         name='comment_review_pub_date_idx'),
+        ]
 
     def __str__(self):
         return (
             f'Пользователь: "{self.author}", '
             f'Текст комментария : "{self.text[:STR_OUTPUT_LIMIT]}".'
         )
+
+
+class OutgoingEmail(models.Model):
+    recipient = models.EmailField('Получатель', max_length=EMAIL_MAX_LENGTH)
+    subject = models.CharField('Тема', max_length=SUBJECT_MAX_LENGTH)
+    message = models.TextField('Текст письма')
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    sent_at = models.DateTimeField(
+        'Дата отправки',
+        null=True,
+        blank=True,
+        db_index=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток отправки',
+        default=0
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    locked_until = models.DateTimeField(
+        'Занято отправкой до',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('created_at',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=('recipient', 'subject'),
+                condition=models.Q(sent_at__isnull=True),
+                name='unique_pending_email'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject[:STR_OUTPUT_LIMIT]}'
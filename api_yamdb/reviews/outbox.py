@@ -0,0 +1,127 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from reviews.constants import (OUTBOX_BATCH_SIZE, OUTBOX_LOCK_SECONDS,
+                               OUTBOX_MAX_ATTEMPTS)
+from reviews.models import OutgoingEmail
+
+
+def enqueue_email(recipient, subject, message):
+    """Ставит письмо в очередь на отправку.
+
+    Неотправленное письмо тому же получателю с той же темой
+    перезаписывается, поэтому повторные запросы не плодят рассылку.
+    Одновременные запросы упираются в unique_pending_email, и
+    update_or_create после IntegrityError обновляет уже вставленную строку.
+    Снятая блокировка не дает воркеру, который уже отправляет старый
+    текст, отметить новое письмо отправленным.
+    """
+    email, _ = OutgoingEmail.objects.update_or_create(
+        recipient=recipient,
+        subject=subject,
+        sent_at=None,
+        defaults={'message': message, 'attempts': 0, 'last_error': '',
+                  'locked_until': None}
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(send_queued_emails)
+    return email
+
+
+def claim_emails(batch_size):
+    """Забирает пачку писем из очереди короткой транзакцией.
+
+    Письма блокируются на OUTBOX_LOCK_SECONDS: другие воркеры их не
+    берут, а письма упавшего воркера вернутся в очередь по истечении срока.
+    """
+    now = timezone.now()
+    locked_until = now + timedelta(seconds=OUTBOX_LOCK_SECONDS)
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+                sent_at__isnull=True,
+                attempts__lt=OUTBOX_MAX_ATTEMPTS
+            )[:batch_size]
+        )
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(locked_until=locked_until)
+    for email in emails:
+        email.locked_until = locked_until
+    return emails
+
+
+def deliver_emails(emails):
+    """Отправляет письма через одно SMTP-соединение вне транзакции.
+
+    Возвращает {id письма: текст ошибки или None}. Ошибка открытия
+    соединения засчитывается как неудачная попытка всем письмам пачки.
+    """
+    connection = get_connection()
+    try:
+        connection.open()
+    except (SMTPException, OSError) as error:
+        return {email.pk: str(error) for email in emails}
+    errors = {}
+    try:
+        for email in emails:
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=settings.FROM_EMAIL,
+                    to=[email.recipient],
+                    connection=connection
+                ).send()
+            except (SMTPException, OSError) as error:
+                errors[email.pk] = str(error)
+            else:
+                errors[email.pk] = None
+    finally:
+        try:
+            connection.close()
+        except (SMTPException, OSError):
+            pass
+    return errors
+
+
+def send_queued_emails(batch_size=OUTBOX_BATCH_SIZE):
+    """Отправляет пачку писем из очереди через одно SMTP-соединение.
+
+    Пачка забирается и результаты записываются короткими транзакциями,
+    сама отправка идет без транзакции, поэтому медленный почтовый сервер
+    не держит блокировки базы. Письма с ошибкой остаются в очереди до
+    OUTBOX_MAX_ATTEMPTS попыток. Возвращает количество отправленных писем.
+    """
+    emails = claim_emails(batch_size)
+    if not emails:
+        return 0
+    errors = deliver_emails(emails)
+    now = timezone.now()
+    sent_count = 0
+    with transaction.atomic():
+        for email in emails:
+            # Письмо, перезаписанное enqueue_email во время отправки,
+            # уже не заблокировано этим воркером и остается в очереди.
+            claimed = OutgoingEmail.objects.filter(
+                pk=email.pk, locked_until=email.locked_until
+            )
+            error = errors[email.pk]
+            if error is None:
+                sent_count += claimed.update(
+                    attempts=F('attempts') + 1, sent_at=now,
+                    last_error='', locked_until=None
+                )
+            else:
+                claimed.update(
+                    attempts=F('attempts') + 1, last_error=error,
+                    locked_until=None
+                )
+    return sent_count
@@ -0,0 +1,133 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.constants import IMPORT_BATCH_SIZE
+from reviews.models import Review, Title, TitleScore
+
+
+def shift_title_rating(title_id, score, count):
+    """Сдвигает сохраненные агрегаты оценок произведения на дельту."""
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score,
+        reviews_count=F('reviews_count') + count
+    )
+
+
+def shift_title_score(title_id, score, count):
+    """Сдвигает число отзывов с оценкой score у произведения на дельту."""
+    scores = TitleScore.objects.filter(title_id=title_id, score=score)
+    if scores.update(count=F('count') + count) or count < 0:
+        return
+    # Первый отзыв с такой оценкой: строку вставляем с игнорированием
+    # конфликта, чтобы параллельная вставка не уронила запись отзыва.
+    TitleScore.objects.bulk_create(
+        [TitleScore(title_id=title_id, score=score)], ignore_conflicts=True
+    )
+    scores.update(count=F('count') + count)
+
+
+def count_title_scores(reviews):
+    """Строки гистограммы оценок, посчитанные по отзывам."""
+    rows = reviews.order_by().values('title_id', 'score').annotate(
+        total=Count('pk')
+    )
+    return [
+        TitleScore(title_id=row['title_id'], score=row['score'],
+                   count=row['total'])
+        for row in rows.iterator()
+    ]
+
+
+def annotate_actual_rating(titles):
+    """Аннотирует произведения агрегатами, посчитанными по отзывам."""
+    return titles.annotate(
+        actual_score_sum=Coalesce(Sum('reviews__score'), 0),
+        actual_reviews_count=Count('reviews')
+    )
+
+
+def get_drifted_titles(titles=None):
+    """Возвращает произведения, у которых агрегаты разошлись с отзывами."""
+    if titles is None:
+        titles = Title.objects.all()
+    return annotate_actual_rating(titles.order_by('pk')).exclude(
+        score_sum=F('actual_score_sum'),
+        reviews_count=F('actual_reviews_count')
+    )
+
+
+def get_drifted_score_title_ids():
+    """Id произведений, у которых гистограмма оценок разошлась с отзывами.
+
+    Сравнивает сохраненные счетчики (title, score) с GROUP BY по отзывам;
+    строки с нулевым счетчиком равны отсутствующим.
+    """
+    actual = {
+        (row.title_id, row.score): row.count
+        for row in count_title_scores(Review.objects.all())
+    }
+    stored = {
+        (title_id, score): count
+        for title_id, score, count in TitleScore.objects.filter(
+            count__gt=0
+        ).values_list('title_id', 'score', 'count').iterator()
+    }
+    return sorted({
+        title_id
+        for (title_id, score), count in actual.items() ^ stored.items()
+    })
+
+
+def rebuild_title_rating(title_id):
+    """Пересчитывает агрегаты и гистограмму оценок одного произведения."""
+    title = annotate_actual_rating(
+        Title.objects.filter(pk=title_id)
+    ).values('actual_score_sum', 'actual_reviews_count').first()
+    if title is None:
+        return
+    Title.objects.filter(pk=title_id).update(
+        score_sum=title['actual_score_sum'],
+        reviews_count=title['actual_reviews_count']
+    )
+    TitleScore.objects.filter(title_id=title_id).delete()
+    TitleScore.objects.bulk_create(
+        count_title_scores(Review.objects.filter(title_id=title_id))
+    )
+
+
+def rebuild_all_ratings():
+    """Пересчитывает агрегаты всех произведений одним UPDATE.
+
+    Гистограммы оценок собираются заново одним GROUP BY по отзывам.
+    """
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0
+        )
+    )
+    TitleScore.objects.all().delete()
+    TitleScore.objects.bulk_create(
+        count_title_scores(Review.objects.all()),
+        batch_size=IMPORT_BATCH_SIZE
+    )
+
+
+def rebuild_drifted_ratings():
+    """Пересчитывает агрегаты, если хотя бы одно произведение разошлось.
+
+    Возвращает список произведений с разошедшимися агрегатами (со старыми
+    значениями) и id произведений с разошедшейся гистограммой оценок.
+    """
+    drifted = list(get_drifted_titles())
+    drifted_score_ids = get_drifted_score_title_ids()
+    if drifted or drifted_score_ids:
+        rebuild_all_ratings()
+    return drifted, drifted_score_ids
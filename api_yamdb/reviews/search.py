@@ -0,0 +1,108 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Collate, Lower
+
+from reviews.constants import SEARCH_CONFIG, TITLE_SEARCH_TABLE
+
+SEARCH_TERM_RE = re.compile(r'\w+')
+ASCII_LOWER = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'
+)
+MAX_CODE_POINT = 0x10FFFF
+
+
+def get_search_terms(query):
+    return SEARCH_TERM_RE.findall(query.lower())
+
+
+def search_titles(queryset, query):
+    """Полнотекстовый поиск произведений по названию и описанию.
+
+    Каждое слово запроса ищется по префиксу, результаты упорядочены по
+    релевантности (совпадения в названии весят больше). Индексы создает
+    миграция 0005_title_search, на прочих базах работает icontains.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+    title_id = '{}.{}'.format(
+        connection.ops.quote_name(queryset.model._meta.db_table),
+        connection.ops.quote_name(queryset.model._meta.pk.column)
+    )
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        condition = RawSQL(
+            f'{title_id} IN (SELECT rowid FROM {TITLE_SEARCH_TABLE} '
+            f'WHERE {TITLE_SEARCH_TABLE} MATCH %s)',
+            (match,), output_field=BooleanField()
+        )
+        # bm25 тем меньше, чем документ релевантнее.
+        rank = RawSQL(
+            f'SELECT -bm25({TITLE_SEARCH_TABLE}, 10.0, 1.0) '
+            f'FROM {TITLE_SEARCH_TABLE} '
+            f'WHERE {TITLE_SEARCH_TABLE} MATCH %s AND rowid = {title_id}',
+            (match,), output_field=FloatField()
+        )
+    elif connection.vendor == 'postgresql':
+        tsquery = 'to_tsquery(%s::regconfig, %s)'
+        params = (SEARCH_CONFIG, ' & '.join(f'{term}:*' for term in terms))
+        search_vector = '{}.search_vector'.format(
+            connection.ops.quote_name(queryset.model._meta.db_table)
+        )
+        condition = RawSQL(
+            f'{search_vector} @@ {tsquery}', params,
+            output_field=BooleanField()
+        )
+        rank = RawSQL(
+            f'ts_rank({search_vector}, {tsquery})', params,
+            output_field=FloatField()
+        )
+    else:
+        lookup = Q()
+        for term in terms:
+            lookup &= Q(name__icontains=term) | Q(description__icontains=term)
+        return queryset.filter(lookup)
+    return queryset.filter(condition).annotate(
+        search_rank=rank
+    ).order_by('-search_rank', 'pk')
+
+
+def get_username_key():
+    """Выражение нормализованного username, по которому построен индекс."""
+    key = Lower('username')
+    if connection.vendor == 'postgresql':
+        key = Collate(key, 'C')
+    return key
+
+
+def normalize_username(value):
+    """Нормализует строку так же, как LOWER() текущей базы.
+
+    LOWER() в SQLite переводит в нижний регистр только латиницу.
+    """
+    if connection.vendor == 'sqlite':
+        return value.translate(ASCII_LOWER)
+    return value.lower()
+
+
+def filter_usernames_by_prefix(queryset, prefix):
+    """Пользователи, чей username начинается с prefix без учета регистра.
+
+    Префикс превращается в диапазон [prefix, следующая строка), который
+    читается из индекса по нормализованному username без полного скана.
+    """
+    prefix = normalize_username(prefix)
+    if not prefix:
+        return queryset.none()
+    queryset = queryset.annotate(
+        username_key=get_username_key()
+    ).filter(username_key__gte=prefix).order_by('username_key')
+    last = ord(prefix[-1])
+    if last < MAX_CODE_POINT:
+        queryset = queryset.filter(
+            username_key__lt=prefix[:-1] + chr(last + 1)
+        )
+    return queryset
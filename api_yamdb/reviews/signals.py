@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from reviews.models import Review
+from reviews.ratings import (rebuild_all_ratings, rebuild_title_rating,
+                             shift_title_rating, shift_title_score)
+
+# Отправляется после массовой записи (bulk_create, COPY и т.п.) в обход
+# post_save, sender - модель, в таблицу которой загружены строки.
+bulk_loaded = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    if created:
+        shift_title_rating(instance.title_id, int(instance.score), 1)
+        shift_title_score(instance.title_id, int(instance.score), 1)
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    old_score = loaded.get('score')
+    old_title_id = loaded.get('title_id')
+    if old_score is None or old_title_id is None:
+        rebuild_title_rating(instance.title_id)
+        return
+    if old_title_id != instance.title_id:
+        shift_title_rating(old_title_id, -int(old_score), -1)
+        shift_title_rating(instance.title_id, int(instance.score), 1)
+    elif int(old_score) != int(instance.score):
+        shift_title_rating(
+            instance.title_id, int(instance.score) - int(old_score), 0
+        )
+    else:
+        return
+    shift_title_score(old_title_id, int(old_score), -1)
+    shift_title_score(instance.title_id, int(instance.score), 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    shift_title_rating(instance.title_id, -int(instance.score), -1)
+    shift_title_score(instance.title_id, int(instance.score), -1)
+
+
+@receiver(bulk_loaded, sender=Review)
+def rebuild_ratings_on_bulk_load(sender, **kwargs):
+    rebuild_all_ratings()
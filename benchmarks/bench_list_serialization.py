@@ -0,0 +1,117 @@
+"""Сравнение скорости выдачи списков через ModelSerializer и через values().
+
+Во временной SQLite-базе создаются произведения с жанрами и отзывами,
+после чего одна и та же страница сериализуется обоими способами.
+Перед замером проверяется, что JSON совпадает байт в байт.
+
+    python benchmarks/bench_list_serialization.py --titles 500 --repeat 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+GENRES_PER_TITLE = 3
+REVIEWS_PER_TITLE = 5
+
+
+def fill_database(titles_count):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Genre, Review, Title, TitleGenre
+    from reviews.ratings import rebuild_all_ratings
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(REVIEWS_PER_TITLE)
+    )
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(10)
+    )
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=1900 + idx % 100,
+              description='Описание ' * 20, category=category)
+        for idx in range(titles_count)
+    )
+    titles = list(Title.objects.all())
+    users = list(User.objects.all())
+    genres = list(Genre.objects.all())
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title=title, genre=genres[(title.pk + idx) % len(genres)])
+        for title in titles for idx in range(GENRES_PER_TITLE)
+    )
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Текст отзыва ' * 10,
+               score=1 + (title.pk + idx) % 10)
+        for title in titles for idx, author in enumerate(users)
+    )
+    rebuild_all_ratings()
+
+
+def measure(label, build, repeat, rows_count):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        build()
+    elapsed = time.perf_counter() - started
+    print(f'{label:>22}: {elapsed / repeat * 1000:.1f} мс на страницу, '
+          f'{rows_count * repeat / elapsed:.0f} строк/с')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = work_dir / 'bench.sqlite3'
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+
+    from api.rows import ReviewRowSerializer, TitleRowSerializer
+    from reviews.models import Review, Title
+
+    call_command('migrate', verbosity=0)
+    fill_database(args.titles)
+
+    renderer = JSONRenderer()
+    querysets = (
+        (TitleRowSerializer, Title.objects.select_related(
+            'category').prefetch_related('genre').order_by('-year', 'pk')),
+        (ReviewRowSerializer, Review.objects.select_related(
+            'author').order_by('-pub_date', 'pk')),
+    )
+    for row_serializer_class, queryset in querysets:
+        def build_serializer():
+            return renderer.render(row_serializer_class.serializer_class(
+                queryset.all(), many=True).data)
+
+        def build_rows():
+            row_serializer = row_serializer_class()
+            return renderer.render(row_serializer.serialize(
+                row_serializer.get_values(queryset.all())))
+
+        assert build_serializer() == build_rows(), 'JSON не совпадает'
+        rows_count = queryset.count()
+        print(f'{row_serializer_class.serializer_class.__name__}, '
+              f'строк: {rows_count}')
+        slow = measure('ModelSerializer', build_serializer, args.repeat,
+                       rows_count)
+        fast = measure('values()', build_rows, args.repeat, rows_count)
+        print(f'{"ускорение":>22}: x{slow / fast:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Сравнение скорости load_from_csv через ORM и через быстрый путь базы.
+
+Данные из api_yamdb/static/data размножаются SCALE раз со сдвигом id
+и уникальных полей, после чего загружаются в отдельную SQLite-базу.
+
+    python benchmarks/bench_load_from_csv.py --scale 200
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+DATA_DIR = PROJECT_DIR / 'static' / 'data'
+ID_STEP = 10 ** 6
+ID_COLUMNS = ('id', 'title_id', 'genre_id', 'review_id', 'category',
+              'author')
+UNIQUE_COLUMNS = ('username', 'email', 'slug')
+
+
+def scale_file(source, target, scale):
+    with open(source, encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        rows = list(reader)
+    with open(target, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for copy in range(scale):
+            for row in rows:
+                writer.writerow([
+                    int(value) + copy * ID_STEP
+                    if column in ID_COLUMNS and value
+                    else f'{copy}-{value}' if column in UNIQUE_COLUMNS
+                    else value
+                    for column, value in zip(header, row)
+                ])
+    return len(rows) * scale
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, default=100)
+    parser.add_argument('--jobs', type=int, default=1)
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = work_dir / 'bench.sqlite3'
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+
+    data_dir = work_dir / 'data'
+    data_dir.mkdir()
+    total_rows = sum(
+        scale_file(source, data_dir / source.name, args.scale)
+        for source in DATA_DIR.glob('*.csv')
+    )
+    call_command('migrate', verbosity=0)
+
+    print(f'Строк: {total_rows}, масштаб: {args.scale}')
+    for title, options in (('ORM', {'orm': True}), ('native', {})):
+        call_command('flush', interactive=False, verbosity=0)
+        started = time.perf_counter()
+        call_command(
+            'load_from_csv', str(data_dir), jobs=args.jobs,
+            stdout=StringIO(), **options
+        )
+        elapsed = time.perf_counter() - started
+        print(f'{title:>7}: {elapsed:.2f} с, {total_rows / elapsed:.0f} '
+              'строк/с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_writes(self, client, admin_client,
+                                             admin, user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения равен средней оценке.'
+        )
+
+        user_review = next(
+            review for review in reviews if review['author'] == user.username
+        )
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=user_review['id']
+        )
+        response = user_client.patch(url, data={'score': 1})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 3, (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки.'
+        )
+
+        response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва.'
+        )
+
+        admin.delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг пересчитывается при каскадном удалении '
+            'отзывов.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.filter(pk=titles[0]['id']).update(
+            score_sum=0, reviews_count=0
+        )
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.reviews_count) == (5, 1), (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает '
+            'агрегаты оценок произведения.'
+        )
@@ -0,0 +1,156 @@
+from http import HTTPStatus
+
+import pytest
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Queries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_titles_list_query_count(self, client, admin_client,
+                                        django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        for idx in range(4):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[idx % 2]['slug'],
+            })
+            assert response.status_code == HTTPStatus.CREATED
+
+        # count + произведения с категориями + жанры одним prefetch.
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 5, (
+            f'Проверьте, что `{self.TITLES_URL}` отдает полную страницу.'
+        )
+
+        # ETag + произведение с категорией + жанры.
+        with django_assert_num_queries(3):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_feeds_query_count(self, client, admin, admin_client, user,
+                                  user_client, moderator, moderator_client,
+                                  django_assert_num_queries):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+
+        # Произведение + ETag одним агрегатом + ответ (count + страница).
+        with django_assert_num_queries(4):
+            response = client.get(reviews_url)
+        assert len(response.json()['results']) == len(reviews)
+
+        # Отзыв вместе с проверкой произведения + ETag + ответ.
+        with django_assert_num_queries(4):
+            response = client.get(comments_url)
+        assert len(response.json()['results']) == len(comments)
+
+        # Пользователь + произведение + отзыв с автором + BEGIN + UPDATE.
+        with django_assert_num_queries(5):
+            response = user_client.patch(
+                f'{reviews_url}{reviews[1]["id"]}/', data={'text': 'new'}
+            )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_duplicate_review_rejected_by_constraint(
+        self, admin_client, user_client
+    ):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'text', 'score': 5}
+        assert user_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение возвращает 400.'
+        )
+        assert 'non_field_errors' in response.json()
+        assert user_client.get(url).json()['count'] == 1
+
+    def test_04_titles_batch_fetch_by_ids(self, client, admin_client,
+                                          django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        ids = [titles[1]['id'], 10 ** 6, titles[0]['id']]
+        url = f'{self.TITLES_URL}?ids={",".join(map(str, ids))}'
+
+        # Произведения с категориями + жанры одним prefetch, без COUNT.
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert isinstance(data, list), (
+            f'Проверьте, что `{self.TITLES_URL}?ids=` возвращает список '
+            'без пагинации.'
+        )
+        assert [title['id'] for title in data] == [
+            titles[1]['id'], titles[0]['id']
+        ], 'Проверьте, что произведения возвращаются в порядке id.'
+        detail = client.get(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert data[1] == detail.json()
+
+        for bad_ids in ('', 'a,b', '-1', ','.join(map(str, range(1, 102)))):
+            response = client.get(f'{self.TITLES_URL}?ids={bad_ids}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что некорректный `ids={bad_ids}` возвращает 400.'
+            )
+
+    def test_05_sparse_fieldsets(self, client, admin_client, user_client,
+                                 django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+
+        # count + произведения без JOIN категорий и без prefetch жанров.
+        with django_assert_num_queries(2) as context:
+            response = client.get(f'{self.TITLES_URL}?fields=id,name,rating')
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                'Проверьте, что `?fields=` оставляет в ответе только '
+                'запрошенные поля.'
+            )
+        titles_sql = context.captured_queries[-1]['sql']
+        assert 'description' not in titles_sql, (
+            'Проверьте, что `?fields=` не читает из БД ненужные колонки.'
+        )
+
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        full = client.get(detail_url).json()
+        response = client.get(f'{detail_url}?omit=description,genre')
+        assert response.json() == {
+            key: value for key, value in full.items()
+            if key not in ('description', 'genre')
+        }, 'Проверьте, что `?omit=` убирает из ответа указанные поля.'
+
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.post(reviews_url, data={'text': 'text', 'score': 7})
+        response = client.get(f'{reviews_url}?fields=id,score')
+        assert response.json()['results'] == [
+            {'id': response.json()['results'][0]['id'], 'score': 7}
+        ]
+
+        for query in ('fields=id,unknown', 'omit=unknown', 'fields='):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `?{query}` возвращает 400.'
+            )
@@ -0,0 +1,150 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from tests.utils import check_pagination, create_reviews, create_single_comment
+
+from api.pagination import PubDateCursorPagination
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Feeds:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def create_comments(self, admin, admin_client, count):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        for idx in range(count):
+            create_single_comment(
+                admin_client, titles[0]['id'], reviews[0]['id'],
+                f'comment {idx}'
+            )
+        return self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+    def test_01_cursor_pagination(self, client, admin, admin_client):
+        url = self.create_comments(admin, admin_client, 7)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == 7, (
+            f'Проверьте, что без параметра `cursor` эндпоинт `{url}` '
+            'сохраняет постраничную пагинацию.'
+        )
+
+        seen = []
+        next_url = f'{url}?cursor='
+        while next_url:
+            response = client.get(next_url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме не считается `count`.'
+            )
+            seen.extend(comment['id'] for comment in data['results'])
+            next_url = data['next']
+        assert seen == sorted(seen, reverse=True) and len(set(seen)) == 7, (
+            f'Проверьте, что курсорная пагинация `{url}` отдает все '
+            'комментарии от новых к старым без повторов.'
+        )
+
+    def test_02_page_number_pagination_kept(self, client, admin,
+                                            admin_client):
+        url = self.create_comments(admin, admin_client, 3)
+        response = client.get(url)
+        check_pagination(url, response.json(), 3)
+
+    def test_03_conditional_get(self, client, admin, admin_client,
+                                django_assert_max_num_queries):
+        url = self.create_comments(admin, admin_client, 2)
+        title_url = url.split('reviews/')[0]
+
+        for resource_url in (url, title_url):
+            response = client.get(resource_url)
+            etag = response.get('ETag')
+            assert etag, (
+                f'Проверьте, что ответ `{resource_url}` содержит ETag.'
+            )
+            with django_assert_max_num_queries(3):
+                response = client.get(
+                    resource_url, HTTP_IF_NONE_MATCH=etag
+                )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что `{resource_url}` отвечает 304, если ETag '
+                'не изменился.'
+            )
+
+        etag = client.get(url)['ETag']
+        comment_id = client.get(url).json()['results'][0]['id']
+        admin_client.patch(f'{url}{comment_id}/', data={'text': 'новый'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение комментария меняет ETag ленты.'
+        )
+        assert response.json()['results'][0]['text'] == 'новый'
+
+        etag = response['ETag']
+        admin_client.delete(f'{url}{comment_id}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария меняет ETag ленты.'
+        )
+
+    def test_04_cursor_with_same_pub_date(self, client, admin, admin_client,
+                                          monkeypatch):
+        from reviews.models import Comment
+
+        url = self.create_comments(admin, admin_client, 9)
+        Comment.objects.update(pub_date=timezone.now())
+        monkeypatch.setattr(PubDateCursorPagination, 'page_size', 2)
+
+        pages = []
+        next_url = f'{url}?cursor='
+        with CaptureQueriesContext(connection) as context:
+            while next_url:
+                data = client.get(next_url).json()
+                pages.append([comment['id'] for comment in data['results']])
+                next_url = data['next']
+        seen = [pk for page in pages for pk in page]
+        assert seen == sorted(seen, reverse=True) and len(set(seen)) == 9, (
+            'Проверьте, что курсорная пагинация отдает все комментарии без '
+            'повторов, даже если у них одинаковая дата публикации.'
+        )
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if 'OFFSET' in query['sql']
+        ], 'Проверьте, что курсор выбирает страницу по ключу без OFFSET.'
+
+        previous_url = data['previous']
+        for page in reversed(pages[:-1]):
+            data = client.get(previous_url).json()
+            assert [comment['id'] for comment in data['results']] == page, (
+                'Проверьте, что ссылка `previous` возвращает предыдущую '
+                'страницу ленты.'
+            )
+            previous_url = data['previous']
+        assert previous_url is None
+
+    def test_05_author_rename_changes_etag(self, client, admin, admin_client):
+        url = self.create_comments(admin, admin_client, 2)
+        review_url = url.split('comments/')[0]
+        reviews_url = review_url.rsplit('/', 2)[0] + '/'
+
+        for resource_url in (url, reviews_url, review_url):
+            etag = client.get(resource_url)['ETag']
+            admin.username = f'{admin.username}x'
+            admin.save()
+            response = client.get(resource_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что переименование автора меняет ETag '
+                f'`{resource_url}`.'
+            )
+            data = response.json()
+            authors = [row['author'] for row in data.get('results', [data])]
+            assert admin.username in authors
@@ -0,0 +1,121 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_repeat_anonymous_reads_skip_database(
+        self, client, admin_client, django_assert_num_queries
+    ):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (self.TITLES_URL, detail_url, self.CATEGORIES_URL):
+            first = client.get(url)
+            assert first.status_code == HTTPStatus.OK
+            with django_assert_num_queries(0):
+                second = client.get(url)
+            assert second.json() == first.json(), (
+                f'Проверьте, что закешированный ответ `{url}` совпадает '
+                'с исходным.'
+            )
+
+    def test_02_writes_invalidate_affected_keys(
+        self, client, admin_client, user_client, django_assert_num_queries
+    ):
+        titles, categories, genres = create_titles(admin_client)
+        first_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        second_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        for url in (first_url, second_url, self.CATEGORIES_URL):
+            client.get(url)
+
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        assert client.get(first_url).json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения.'
+        )
+        with django_assert_num_queries(0):
+            client.get(second_url)
+
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(self.CATEGORIES_URL).json()['count'] == (
+            len(categories) + 1
+        ), 'Проверьте, что создание категории сбрасывает кеш списка.'
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert client.get(first_url).json()['genre'] == [genres[1]], (
+            'Проверьте, что удаление жанра сбрасывает кеш его произведений.'
+        )
+
+    def test_03_invalidation_waits_for_commit(self):
+        from django.db import transaction
+
+        from api.cache import (TITLES_NAMESPACE, get_namespace_versions,
+                               invalidate_namespaces)
+
+        versions = get_namespace_versions([TITLES_NAMESPACE])
+        with transaction.atomic():
+            invalidate_namespaces(TITLES_NAMESPACE)
+            assert get_namespace_versions([TITLES_NAMESPACE]) == versions, (
+                'Проверьте, что кеш инвалидируется только после коммита '
+                'транзакции.'
+            )
+        versions_after_commit = get_namespace_versions([TITLES_NAMESPACE])
+        assert versions_after_commit != versions
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                invalidate_namespaces(TITLES_NAMESPACE)
+                raise RuntimeError
+        assert get_namespace_versions([TITLES_NAMESPACE]) == (
+            versions_after_commit
+        ), 'Проверьте, что откат транзакции не сбрасывает кеш.'
+
+    def test_04_rebuild_ratings_invalidates(self, client, admin_client,
+                                            user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 7)
+        Title.objects.filter(pk=title_id).update(score_sum=0, reviews_count=0)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        for url in (self.TITLES_URL, detail_url):
+            client.get(url)
+
+        call_command('rebuild_ratings')
+        assert client.get(detail_url).json()['rating'] == 7, (
+            'Проверьте, что команда `rebuild_ratings` сбрасывает кеш '
+            'произведения.'
+        )
+        ratings = {
+            title['id']: title['rating']
+            for title in client.get(self.TITLES_URL).json()['results']
+        }
+        assert ratings[title_id] == 7, (
+            'Проверьте, что команда `rebuild_ratings` сбрасывает кеш списка '
+            'произведений.'
+        )
+
+    def test_05_cache_shared_between_processes(self):
+        backend = settings.CACHES['default']['BACKEND']
+        assert 'locmem' not in backend, (
+            'Проверьте, что кеш по умолчанию общий для всех процессов: '
+            'management-команды должны сбрасывать кеш сервера.'
+        )
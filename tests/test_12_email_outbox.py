@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+
+
+class UnreachableBackend(EmailBackend):
+    """Почтовый сервер недоступен: соединение не открывается."""
+
+    def open(self):
+        raise ConnectionRefusedError('Connection refused')
+
+
+class CheckingBackend(EmailBackend):
+    """Запоминает, шла ли отправка внутри транзакции базы."""
+
+    in_atomic_block = []
+
+    def send_messages(self, messages):
+        self.in_atomic_block.append(connection.in_atomic_block)
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_does_not_wait_for_mail(self, client, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+        valid_data = {'email': 'valid@yamdb.fake', 'username': 'valid'}
+
+        for _ in range(3):
+            response = client.post(self.URL_SIGNUP, data=valid_data)
+            assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            f'Проверьте, что `{self.URL_SIGNUP}` не отправляет письмо '
+            'в потоке запроса.'
+        )
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что повторные регистрации не дублируют письма, '
+            'а команда `send_emails` отправляет очередь.'
+        )
+        assert mail.outbox[0].to == [valid_data['email']]
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленные письма не уходят повторно.'
+        )
+
+    def test_02_one_pending_email_per_recipient_and_subject(self, settings):
+        from django.db import IntegrityError, transaction
+        from django.utils import timezone
+
+        from reviews.models import OutgoingEmail
+        from reviews.outbox import enqueue_email
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        email = enqueue_email('valid@yamdb.fake', 'Тема', 'первое')
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                OutgoingEmail.objects.create(recipient=email.recipient,
+                                             subject=email.subject,
+                                             message='дубль')
+        assert enqueue_email(email.recipient, email.subject,
+                             'второе').pk == email.pk
+
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            sent_at=timezone.now()
+        )
+        assert enqueue_email(email.recipient, email.subject,
+                             'третье').pk != email.pk, (
+            'Проверьте, что уникальность действует только для '
+            'неотправленных писем.'
+        )
+
+    def test_03_unreachable_server_counts_attempt(self, client, settings):
+        from reviews.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = (
+            'tests.test_12_email_outbox.UnreachableBackend'
+        )
+        settings.EMAIL_OUTBOX_EAGER = True
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid'
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что недоступный почтовый сервер не ломает '
+            f'`{self.URL_SIGNUP}`.'
+        )
+        call_command('send_emails')
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 2, (
+            'Проверьте, что ошибка подключения к серверу засчитывается как '
+            'попытка отправки.'
+        )
+        assert 'refused' in email.last_error
+        assert email.locked_until is None
+
+    def test_04_send_outside_transaction(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_12_email_outbox.CheckingBackend'
+        settings.EMAIL_OUTBOX_EAGER = False
+        CheckingBackend.in_atomic_block.clear()
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid'
+        })
+        assert response.status_code == HTTPStatus.OK
+        call_command('send_emails')
+        assert CheckingBackend.in_atomic_block == [False], (
+            'Проверьте, что письма отправляются вне транзакции базы.'
+        )
+        assert len(mail.outbox) == 1
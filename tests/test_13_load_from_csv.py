@@ -0,0 +1,192 @@
+import csv
+import gzip
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(file_name):
+    with open(os.path.join(DATA_DIR, file_name), encoding='utf-8-sig') as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13LoadFromCsv:
+
+    def get_snapshot(self):
+        from reviews.csv_files import CSV_LAYOUT
+
+        return {
+            name: list(model_class.objects.order_by('pk').values_list(*[
+                model_class._meta.get_field(column).attname
+                for column in header
+            ]))
+            for name, model_class, header in CSV_LAYOUT
+        }
+
+    def test_01_load_sample_data(self):
+        from reviews.models import (Category, Comment, Genre, Review, Title,
+                                    TitleGenre, User)
+
+        call_command('load_from_csv', DATA_DIR)
+
+        expected = {
+            User: 'users.csv',
+            Category: 'category.csv',
+            Genre: 'genre.csv',
+            Title: 'titles.csv',
+            TitleGenre: 'genre_title.csv',
+            Review: 'review.csv',
+            Comment: 'comments.csv',
+        }
+        for model, file_name in expected.items():
+            assert model.objects.count() == count_rows(file_name), (
+                f'Проверьте, что `load_from_csv` загружает все строки '
+                f'файла `{file_name}`.'
+            )
+        call_command('rebuild_ratings', '--check')
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `load_from_csv` сохраняет даты из csv.'
+        )
+
+    def test_02_load_into_filled_database(self):
+        call_command('load_from_csv', DATA_DIR)
+        with pytest.raises(CommandError):
+            call_command('load_from_csv', DATA_DIR)
+
+    def test_03_parallel_load_sample_data(self):
+        from reviews.models import Comment, Review, Title, TitleGenre, User
+
+        call_command('load_from_csv', DATA_DIR, jobs=3)
+
+        expected = {
+            User: 'users.csv',
+            Title: 'titles.csv',
+            TitleGenre: 'genre_title.csv',
+            Review: 'review.csv',
+            Comment: 'comments.csv',
+        }
+        for model, file_name in expected.items():
+            assert model.objects.count() == count_rows(file_name), (
+                f'Проверьте, что `load_from_csv --jobs` загружает все строки '
+                f'файла `{file_name}`.'
+            )
+        call_command('rebuild_ratings', '--check')
+
+    def test_04_orm_load_sample_data(self, client):
+        from reviews.models import Comment, Review
+
+        call_command('load_from_csv', DATA_DIR, orm=True)
+        assert Review.objects.count() == count_rows('review.csv')
+        assert Comment.objects.count() == count_rows('comments.csv')
+        review = Review.objects.order_by('pk').first()
+        response = client.get(
+            f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/'
+        )
+        assert response.json()['author'] == review.author.username
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `load_from_csv --orm` сохраняет даты из csv.'
+        )
+
+    def test_05_dump_round_trip(self, tmp_path):
+        from django.utils import timezone
+
+        from reviews.models import User
+
+        call_command('load_from_csv', DATA_DIR, stdout=StringIO())
+        user = User.objects.order_by('pk').first()
+        user.set_password('backup-password')
+        user.is_staff = user.is_superuser = True
+        user.last_login = timezone.now()
+        user.save()
+        call_command('dump_to_csv', str(tmp_path / 'plain'), stdout=StringIO())
+        call_command('dump_to_csv', str(tmp_path / 'gzip'), gzip=True, jobs=3,
+                     chunk_size=7, stdout=StringIO())
+
+        for path in sorted((tmp_path / 'plain').iterdir()):
+            original = os.path.join(DATA_DIR, path.name)
+            with open(path, encoding='utf-8', newline='') as file:
+                dumped = file.read()
+            assert sum(1 for _ in csv.reader(StringIO(dumped))) - 1 == (
+                count_rows(original)
+            ), f'Проверьте, что `dump_to_csv` выгружает все строки {path}.'
+            with gzip.open(tmp_path / 'gzip' / f'{path.name}.gz', 'rt',
+                           encoding='utf-8', newline='') as file:
+                assert file.read() == dumped, (
+                    'Проверьте, что `dump_to_csv --gzip --jobs` выгружает '
+                    'те же данные.'
+                )
+
+        snapshot = self.get_snapshot()
+        call_command('flush', interactive=False)
+        call_command('load_from_csv', str(tmp_path / 'gzip'),
+                     stdout=StringIO())
+        assert self.get_snapshot() == snapshot, (
+            'Проверьте, что после выгрузки и загрузки обратно данные в базе '
+            'не меняются, в том числе NULL не становится пустой строкой.'
+        )
+        assert User.objects.get(pk=user.pk).check_password(
+            'backup-password'
+        ), 'Проверьте, что `dump_to_csv` выгружает пароли пользователей.'
+        call_command('flush', interactive=False)
+        call_command('load_from_csv', str(tmp_path / 'plain'), jobs=3,
+                     orm=True, stdout=StringIO())
+        assert self.get_snapshot() == snapshot, (
+            'Проверьте, что полная выгрузка загружается и через '
+            '`load_from_csv --jobs --orm`.'
+        )
+        call_command('dump_to_csv', str(tmp_path / 'again'), stdout=StringIO())
+        for path in sorted((tmp_path / 'plain').iterdir()):
+            assert path.read_bytes() == (
+                tmp_path / 'again' / path.name
+            ).read_bytes(), (
+                f'Проверьте, что выгрузка `{path.name}` после загрузки '
+                'обратно совпадает с исходной.'
+            )
+
+    @pytest.mark.parametrize('orm', (False, True))
+    def test_06_batched_load(self, monkeypatch, orm):
+        from reviews.bulk_writers import get_writer_class
+        from reviews.models import Comment, Review
+
+        writer_class = get_writer_class(orm=orm)
+        batch_sizes = []
+        write = writer_class.write
+
+        def spy_write(self, rows):
+            batch_sizes.append(len(rows))
+            return write(self, rows)
+
+        monkeypatch.setattr(writer_class, 'write', spy_write)
+        stdout = StringIO()
+        call_command('load_from_csv', DATA_DIR, batch_size=3,
+                     report_every=10, orm=orm, stdout=stdout)
+
+        assert batch_sizes and max(batch_sizes) == 3, (
+            'Проверьте, что `load_from_csv` пишет строки пачками по '
+            '`--batch-size`.'
+        )
+        assert Review.objects.count() == count_rows('review.csv')
+        assert Comment.objects.count() == count_rows('comments.csv')
+        assert Review.objects.filter(pub_date__year=2019).count() == (
+            Review.objects.count()
+        ), 'Проверьте, что пачки сохраняют даты из csv.'
+        call_command('rebuild_ratings', '--check', stdout=StringIO())
+
+        reviews_count = count_rows('review.csv')
+        progress = [
+            line for line in stdout.getvalue().splitlines()
+            if line.startswith('Review:')
+        ]
+        assert len(progress) == reviews_count // 10 + 1, (
+            'Проверьте, что прогресс выводится каждые `--report-every` '
+            'строк и в конце загрузки, а не на каждую строку.'
+        )
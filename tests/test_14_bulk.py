@@ -0,0 +1,181 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14BulkWrites:
+
+    TITLES_BULK_URL = '/api/v1/titles/bulk/'
+    CATEGORIES_BULK_URL = '/api/v1/categories/bulk/'
+    GENRES_BULK_URL = '/api/v1/genres/bulk/'
+
+    def make_titles(self, genres, categories, count):
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx % 20,
+                'genre': [genre['slug'] for genre in genres[:2]],
+                'category': categories[idx % 2]['slug'],
+            }
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create_titles(self, admin_client, user_client):
+        _, categories, genres = create_titles(admin_client)
+        payload = self.make_titles(genres, categories, 3)
+
+        response = user_client.post(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовое создание произведений доступно только '
+            'администратору.'
+        )
+
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к '
+            f'`{self.TITLES_BULK_URL}` создает произведения.'
+        )
+        data = response.json()
+        assert [item['name'] for item in data] == [
+            item['name'] for item in payload
+        ], 'Проверьте, что ответ сохраняет порядок переданных объектов.'
+        for item in data:
+            assert item['id'], 'Проверьте, что в ответе есть id.'
+            assert len(item['genre']) == 2, (
+                'Проверьте, что жанры созданных произведений сохранены.'
+            )
+            detail = admin_client.get(f'/api/v1/titles/{item["id"]}/')
+            assert detail.json() == item
+
+    def test_02_bulk_errors_are_per_item_and_atomic(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        payload = self.make_titles(genres, categories, 3)
+        payload[1]['category'] = 'no-such-category'
+        payload[2]['genre'] = []
+
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3, (
+            'Проверьте, что ошибки возвращаются списком по позициям запроса.'
+        )
+        assert errors[0] == {}
+        assert 'category' in errors[1]
+        assert 'genre' in errors[2]
+        assert len(admin_client.get('/api/v1/titles/').json()['results']) == (
+            len(titles)
+        ), 'Проверьте, что при ошибке не создается ни одно произведение.'
+
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data={'name': 'not a list'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_bulk_update_titles(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        payload = [
+            {'id': titles[0]['id'], 'year': 1991},
+            {'id': titles[1]['id'], 'genre': [genres[0]['slug']],
+             'category': categories[0]['slug']},
+        ]
+        response = admin_client.patch(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что PATCH-запрос администратора к '
+            f'`{self.TITLES_BULK_URL}` изменяет произведения.'
+        )
+        first, second = response.json()
+        assert first['year'] == 1991
+        assert first['name'] == titles[0]['name']
+        assert len(first['genre']) == 2
+        assert [genre['slug'] for genre in second['genre']] == [
+            genres[0]['slug']
+        ]
+        assert second['category']['slug'] == categories[0]['slug']
+
+        response = admin_client.patch(
+            self.TITLES_BULK_URL,
+            data=[{'id': titles[0]['id'], 'year': 1992}, {'id': 0}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'id' in response.json()[1]
+        detail = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert detail.json()['year'] == 1991
+
+    def test_04_bulk_create_tags(self, admin_client):
+        for url in (self.CATEGORIES_BULK_URL, self.GENRES_BULK_URL):
+            payload = [
+                {'name': f'Имя {idx}', 'slug': f'slug-{idx}'}
+                for idx in range(3)
+            ]
+            response = admin_client.post(url, data=payload, format='json')
+            assert response.status_code == HTTPStatus.CREATED, (
+                f'Проверьте, что POST-запрос администратора к `{url}` '
+                'создает объекты.'
+            )
+            assert response.json() == payload
+
+            response = admin_client.post(url, data=[
+                {'name': 'Новое', 'slug': 'slug-new'},
+                {'name': 'Повтор', 'slug': 'slug-0'},
+                {'name': 'Дубль', 'slug': 'slug-new'},
+            ], format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            errors = response.json()
+            assert errors[0] == {}
+            assert 'slug' in errors[1] and 'slug' in errors[2], (
+                'Проверьте, что занятые и повторяющиеся slug отклоняются.'
+            )
+
+    def test_05_query_count_does_not_grow(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        requests = (
+            (self.TITLES_BULK_URL,
+             lambda count: self.make_titles(genres, categories, count)),
+            (self.CATEGORIES_BULK_URL,
+             lambda count: [{'name': str(idx), 'slug': f'c{count}-{idx}'}
+                            for idx in range(count)]),
+        )
+        for url, make_payload in requests:
+            counts = []
+            for count in (2, 50):
+                with CaptureQueriesContext(connection) as context:
+                    response = admin_client.post(
+                        url, data=make_payload(count), format='json'
+                    )
+                assert response.status_code == HTTPStatus.CREATED
+                counts.append(len(context.captured_queries))
+            assert counts[0] == counts[1], (
+                f'Проверьте, что число запросов к БД при POST-запросе к '
+                f'`{url}` не зависит от количества объектов.'
+            )
+
+    def test_06_reserved_slug(self, admin_client):
+        for url in (self.CATEGORIES_BULK_URL, self.GENRES_BULK_URL):
+            list_url = url.replace('bulk/', '')
+            response = admin_client.post(
+                list_url, data={'name': 'Массовый', 'slug': 'bulk'}
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что slug `bulk` нельзя создать через '
+                f'`{list_url}`: объект был бы недоступен по `{url}`.'
+            )
+            response = admin_client.post(
+                url, data=[{'name': 'Массовый', 'slug': 'bulk'}],
+                content_type='application/json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что slug `bulk` нельзя создать через `{url}`.'
+            )
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+from tests.utils import create_comments, create_titles
+
+from api.rows import (CommentRowSerializer, ReviewRowSerializer,
+                      TitleRowSerializer)
+from reviews.models import Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15RowLists:
+
+    def assert_same_json(self, row_serializer_class, queryset, fields=None):
+        context = {'sparse_fields': fields}
+        expected = row_serializer_class.serializer_class(
+            queryset, many=True, context=context
+        ).data
+        row_serializer = row_serializer_class(fields=fields)
+        actual = row_serializer.serialize(
+            row_serializer.get_values(queryset)
+        )
+        renderer = JSONRenderer()
+        assert renderer.render(actual) == renderer.render(expected), (
+            f'Проверьте, что `{row_serializer_class.__name__}` выдает тот '
+            'же JSON, что и сериализатор модели.'
+        )
+
+    def test_01_rows_match_serializers(self, admin_client, user,
+                                       user_client, moderator,
+                                       moderator_client):
+        _, _, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        # Второе произведение без отзывов и без описания: rating и
+        # description должны выдаваться как null.
+        Title.objects.filter(pk=titles[1]['id']).update(description=None)
+
+        titles_queryset = Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre').order_by('-year')
+        reviews_queryset = Review.objects.select_related('author')
+        comments_queryset = Comment.objects.select_related('author')
+        for fields in (None, frozenset({'id', 'rating', 'genre'})):
+            self.assert_same_json(
+                TitleRowSerializer, titles_queryset, fields
+            )
+        # Порядок жанров не зависит от порядка (и collation) базы.
+        self.assert_same_json(
+            TitleRowSerializer,
+            titles_queryset.prefetch_related(None).prefetch_related(
+                Prefetch('genre', queryset=Genre.objects.order_by('-name'))
+            )
+        )
+        for fields in (None, frozenset({'author', 'pub_date'})):
+            self.assert_same_json(
+                ReviewRowSerializer, reviews_queryset, fields
+            )
+            self.assert_same_json(
+                CommentRowSerializer, comments_queryset, fields
+            )
+
+    def test_02_list_endpoints_use_rows(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        detail = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert detail in response.json()['results'], (
+            'Проверьте, что список произведений совпадает с выдачей '
+            'отдельного произведения.'
+        )
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                              '?cursor=&fields=id')
+        assert response.status_code == HTTPStatus.OK
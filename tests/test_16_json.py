@@ -0,0 +1,89 @@
+import datetime
+import io
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.utils.functional import lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+SAMPLE_DATA = {
+    'text': 'Юникод и разделители строк: \u2028 \u2029',
+    'date': datetime.datetime(2020, 1, 2, 3, 4, 5, 678901,
+                              tzinfo=datetime.timezone.utc),
+    'day': datetime.date(2020, 1, 2),
+    'decimal': Decimal('1.50'),
+    'lazy': lazy(lambda: 'ленивая строка', str)(),
+    'items': [1, 2.5, None, True, {'nested': []}],
+}
+
+
+@pytest.fixture(params=('orjson', 'stdlib'))
+def json_backend(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+    elif renderers.orjson is None:
+        pytest.skip('orjson не установлен')
+    return request.param
+
+
+class Test16JSON:
+
+    def test_01_renderer_matches_drf(self, json_backend):
+        assert FastJSONRenderer().render(SAMPLE_DATA) == (
+            JSONRenderer().render(SAMPLE_DATA)
+        ), (
+            'Проверьте, что FastJSONRenderer выдает тот же JSON, что и '
+            'стандартный JSONRenderer.'
+        )
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_02_chunks_join_to_full_render(self, json_backend):
+        renderer = FastJSONRenderer()
+        for items in ([], [SAMPLE_DATA], [{'id': idx} for idx in range(25)]):
+            assert b''.join(renderer.render_chunks(items, chunk_size=10)) == (
+                renderer.render(items)
+            ), 'Проверьте, что части списка склеиваются в полный JSON.'
+
+    def test_03_parser(self, json_backend):
+        parser = FastJSONParser()
+        body = '{"name": "Имя", "ids": [1, 2]}'.encode()
+        assert parser.parse(io.BytesIO(body)) == {
+            'name': 'Имя', 'ids': [1, 2]
+        }
+        for broken in (b'{"name": ', b'[NaN]'):
+            with pytest.raises(ParseError):
+                parser.parse(io.BytesIO(broken))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Streaming:
+
+    def test_01_large_lists_are_streamed(self, admin_client, monkeypatch):
+        monkeypatch.setattr(
+            renderers.StreamingListMixin, 'stream_min_items', 10
+        )
+        payload = [
+            {'name': f'Жанр {idx}', 'slug': f'genre-{idx}'}
+            for idx in range(25)
+        ]
+        response = admin_client.post(
+            '/api/v1/genres/bulk/', data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.streaming, (
+            'Проверьте, что большие списки отдаются потоковым ответом.'
+        )
+        assert response['Content-Type'] == 'application/json'
+        assert b''.join(response.streaming_content) == (
+            JSONRenderer().render(payload)
+        )
+
+        response = admin_client.get('/api/v1/genres/')
+        assert not response.streaming
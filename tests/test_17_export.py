@@ -0,0 +1,60 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from tests.utils import create_single_review, create_titles
+
+from api.export import TitleExportMixin
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitlesExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    def read_lines(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL}` отдает потоковый ответ.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        body = b''.join(response.streaming_content).decode()
+        assert body.endswith('\n') or not body
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_01_export_is_admin_only(self, client, user_client,
+                                     moderator_client):
+        assert client.get(self.EXPORT_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        for not_admin in (user_client, moderator_client):
+            assert not_admin.get(self.EXPORT_URL).status_code == (
+                HTTPStatus.FORBIDDEN
+            ), f'Проверьте, что `{self.EXPORT_URL}` доступен только админу.'
+
+    def test_02_export_lines_and_resume(self, admin_client, user_client,
+                                        monkeypatch):
+        monkeypatch.setattr(TitleExportMixin, 'export_chunk_size', 1)
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 8)
+
+        exported = self.read_lines(admin_client.get(self.EXPORT_URL))
+        assert [title['id'] for title in exported] == sorted(
+            title['id'] for title in titles
+        ), 'Проверьте, что выгружаются все произведения по возрастанию id.'
+        for title in exported:
+            detail = admin_client.get(f'/api/v1/titles/{title["id"]}/')
+            assert title == detail.json(), (
+                'Проверьте, что строка выгрузки совпадает с выдачей '
+                'произведения.'
+            )
+        assert exported[0]['rating'] == 8
+
+        resumed = self.read_lines(
+            admin_client.get(f'{self.EXPORT_URL}?after={exported[0]["id"]}')
+        )
+        assert resumed == exported[1:], (
+            'Проверьте, что `?after=` продолжает выгрузку после указанного id.'
+        )
+        response = admin_client.get(f'{self.EXPORT_URL}?after=abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from tests.utils import create_titles
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query, **params):
+        response = client.get(self.TITLES_URL, data={'search': query,
+                                                     **params})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Хроники Терминатора',
+            'year': 2008,
+            'genre': [genres[2]['slug']],
+            'category': categories[1]['slug'],
+            'description': 'Сериал о Саре Коннор',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+
+        assert self.search(client, 'терминатор') == [
+            'Терминатор', 'Хроники Терминатора'
+        ], (
+            'Проверьте, что `search=` ищет по словам названия с учетом '
+            'регистра и сортирует результаты по релевантности.'
+        )
+        assert self.search(client, 'Терм') == [
+            'Терминатор', 'Хроники Терминатора'
+        ], 'Проверьте, что `search=` ищет слова по префиксу.'
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что `search=` ищет по описанию.'
+        )
+        assert self.search(client, 'Терминатор Коннор') == [
+            'Хроники Терминатора'
+        ]
+        assert self.search(client, 'терминатор',
+                           genre=genres[2]['slug']) == [
+            'Хроники Терминатора'
+        ], 'Проверьте, что `search=` сочетается с другими фильтрами.'
+        assert self.search(client, '!!!') == []
+
+    def test_02_index_follows_title_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        response = admin_client.patch(url, data={'name': 'Робокоп'})
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'робокоп') == ['Робокоп'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+
+        Title.objects.filter(pk=titles[1]['id']).update(
+            description='Новое описание'
+        )
+        assert self.search(client, 'описание') == ['Крепкий орешек']
+
+        assert admin_client.delete(url).status_code == HTTPStatus.NO_CONTENT
+        assert self.search(client, 'робокоп') == [], (
+            'Проверьте, что удаленные произведения пропадают из поиска.'
+        )
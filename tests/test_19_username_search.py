@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.search import filter_usernames_by_prefix
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19UsernameSearch:
+
+    USERS_URL = '/api/v1/users/'
+    AUTOCOMPLETE_URL = '/api/v1/users/autocomplete/'
+    USERNAMES = ('Adam', 'adele', 'admiral', 'bob', 'Adz', 'ad_min')
+
+    @pytest.fixture
+    def users(self, django_user_model):
+        return django_user_model.objects.bulk_create(
+            django_user_model(username=name, email=f'{name}@yamdb.fake')
+            for name in self.USERNAMES
+        )
+
+    def test_01_prefix_filter(self, admin_client, users):
+        response = admin_client.get(self.USERS_URL, data={'prefix': 'AD'})
+        assert response.status_code == HTTPStatus.OK
+        usernames = [user['username'] for user in response.json()['results']]
+        assert usernames == ['ad_min', 'Adam', 'adele', 'admiral', 'Adz'], (
+            'Проверьте, что `?prefix=` находит пользователей по началу '
+            'username без учета регистра.'
+        )
+        response = admin_client.get(self.USERS_URL, data={'prefix': 'adm'})
+        assert [user['username'] for user in response.json()['results']] == [
+            'admiral'
+        ]
+        response = admin_client.get(self.USERS_URL, data={'search': 'mir'})
+        assert [user['username'] for user in response.json()['results']] == [
+            'admiral'
+        ], 'Проверьте, что поиск подстроки `?search=` продолжает работать.'
+
+    def test_02_autocomplete(self, client, user_client, admin_client, users):
+        assert client.get(self.AUTOCOMPLETE_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.AUTOCOMPLETE_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get(
+            self.AUTOCOMPLETE_URL, data={'prefix': 'ade'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == ['adele'], (
+            f'Проверьте, что `{self.AUTOCOMPLETE_URL}` возвращает только '
+            'список имен пользователей.'
+        )
+        response = admin_client.get(self.AUTOCOMPLETE_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_prefix_uses_index(self, django_user_model):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется для SQLite.')
+        queryset = filter_usernames_by_prefix(
+            django_user_model.objects.all(), 'ad'
+        )
+        plan = queryset.explain()
+        assert 'reviews_user_username_lower_idx' in plan, (
+            'Проверьте, что поиск по префиксу читает индекс по '
+            f'нормализованному username, а не всю таблицу: {plan}'
+        )
+
+    def test_04_reserved_username(self, client, admin_client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'autocomplete', 'email': 'auto@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что имя `autocomplete` нельзя зарегистрировать: '
+            f'пользователь был бы недоступен по `{self.AUTOCOMPLETE_URL}`.'
+        )
+        response = admin_client.post(self.USERS_URL, data={
+            'username': 'autocomplete', 'email': 'auto@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что администратор не может создать пользователя '
+            '`autocomplete`.'
+        )
@@ -0,0 +1,69 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_comments
+
+from api.pagination import PubDateCursorPagination
+
+
+def get_bad_plan_steps(sql):
+    """Шаги плана SQLite с полным проходом таблицы или сортировкой."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        details = [row[-1] for row in cursor.fetchall()]
+    return [
+        detail for detail in details
+        if detail.startswith('SCAN') and ' INDEX' not in detail
+        or detail.startswith('USE TEMP B-TREE')
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20QueryPlans:
+
+    def test_01_feeds_and_filters_use_indexes(self, client, admin,
+                                              admin_client, user, user_client,
+                                              moderator, moderator_client,
+                                              monkeypatch):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Планы запросов проверяются на SQLite.')
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        genre = client.get('/api/v1/genres/').json()['results'][0]['slug']
+        category = client.get(
+            '/api/v1/categories/'
+        ).json()['results'][0]['slug']
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        monkeypatch.setattr(PubDateCursorPagination, 'page_size', 1)
+        next_cursor_url = client.get(f'{reviews_url}?cursor=').json()['next']
+        assert next_cursor_url
+        urls = (
+            reviews_url,
+            comments_url,
+            f'{reviews_url}?cursor=',
+            f'{comments_url}?cursor=',
+            next_cursor_url,
+            '/api/v1/titles/',
+            f'/api/v1/titles/?category={category}',
+            f'/api/v1/titles/?genre={genre}',
+            f'/api/v1/titles/?category={category}&genre={genre}',
+            '/api/v1/titles/?year=2000',
+        )
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                client.get(url)
+            queries = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+            ]
+            assert queries
+            for sql in queries:
+                assert not get_bad_plan_steps(sql), (
+                    f'Проверьте, что запросы `{url}` идут по индексам без '
+                    f'полного прохода таблиц и временной сортировки: {sql}'
+                )
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from tests.utils import create_titles
+
+from reviews.models import Genre, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleGenre:
+
+    TITLES_URL = '/api/v1/titles/'
+    BEFORE_CLEANUP = [('reviews', '0007_feed_and_filter_indexes')]
+    AFTER_CLEANUP = [('reviews', '0008_titlegenre_constraints')]
+
+    def test_01_pairs_are_unique(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['genre']) == 1, (
+            'Проверьте, что повтор жанра в запросе не создает вторую связь.'
+        )
+        title_genre = TitleGenre.objects.filter(
+            title_id=response.json()['id']
+        ).get()
+        with pytest.raises(IntegrityError):
+            TitleGenre.objects.create(title_id=title_genre.title_id,
+                                      genre_id=title_genre.genre_id)
+
+    def test_02_genre_delete_removes_links(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        response = admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not TitleGenre.objects.filter(genre__isnull=True).exists(), (
+            'Проверьте, что удаление жанра удаляет его связи с '
+            'произведениями.'
+        )
+        response = admin_client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert genres[0]['slug'] not in [
+            genre['slug'] for genre in response.json()['genre']
+        ]
+
+    def test_03_migration_removes_orphans_and_duplicates(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.BEFORE_CLEANUP)
+        old_apps = executor.loader.project_state(self.BEFORE_CLEANUP).apps
+        OldTitle = old_apps.get_model('reviews', 'Title')
+        OldGenre = old_apps.get_model('reviews', 'Genre')
+        OldTitleGenre = old_apps.get_model('reviews', 'TitleGenre')
+        title = OldTitle.objects.create(name='Чужой', year=1979)
+        genre = OldGenre.objects.create(name='Ужасы', slug='horror')
+        kept = OldTitleGenre.objects.create(title=title, genre=genre)
+        OldTitleGenre.objects.create(title=title, genre=genre)
+        OldTitleGenre.objects.create(title=title, genre=None)
+        OldTitleGenre.objects.create(title=None, genre=genre)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.AFTER_CLEANUP)
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+        assert list(TitleGenre.objects.values_list('pk', flat=True)) == [
+            kept.pk
+        ], (
+            'Проверьте, что миграция удаляет связи без произведения или '
+            'жанра и повторяющиеся пары.'
+        )
+        assert list(Title.objects.get(pk=title.pk).genre.all()) == [
+            Genre.objects.get(pk=genre.pk)
+        ]
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from tests.utils import create_reviews, create_single_review
+
+from reviews.constants import MAX_SCORE_VALUE, MIN_SCORE_VALUE
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleStats:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_scores(self, client, title_id, **expected):
+        response = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что распределение оценок доступно без авторизации.'
+        )
+        data = response.json()
+        assert list(data['scores']) == [
+            str(score) for score in range(MIN_SCORE_VALUE, MAX_SCORE_VALUE + 1)
+        ], 'Проверьте, что в ответе есть все оценки по порядку.'
+        assert data['reviews_count'] == sum(data['scores'].values())
+        return {
+            score: count for score, count in data['scores'].items() if count
+        }
+
+    def test_01_stats_follow_review_writes(self, client, admin_client,
+                                           admin, user_client, user,
+                                           moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_scores(client, title_id) == {'5': 2}
+        assert self.get_scores(client, titles[1]['id']) == {}
+
+        create_single_review(moderator_client, title_id, 'Отзыв', 9)
+        assert self.get_scores(client, title_id) == {'5': 2, '9': 1}, (
+            'Проверьте, что распределение оценок обновляется при создании '
+            'отзыва.'
+        )
+
+        user_review = next(
+            review for review in reviews if review['author'] == user.username
+        )
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=user_review['id']
+        )
+        response = user_client.patch(url, data={'score': 9})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_scores(client, title_id) == {'5': 1, '9': 2}, (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'оценки.'
+        )
+
+        assert user_client.delete(url).status_code == HTTPStatus.NO_CONTENT
+        admin.delete()
+        assert self.get_scores(client, title_id) == {'9': 1}, (
+            'Проверьте, что распределение оценок обновляется при удалении '
+            'отзывов.'
+        )
+
+    def test_02_stats_not_found_and_rebuild(self, client, admin_client,
+                                            admin):
+        from reviews.models import Title, TitleScore
+
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id=999))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        TitleScore.objects.all().delete()
+        Title.objects.filter(pk=title_id).update(score_sum=0, reviews_count=0)
+        call_command('rebuild_ratings')
+        assert self.get_scores(admin_client, title_id) == {'5': 1}, (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает '
+            'распределение оценок.'
+        )
+
+    def test_03_rebuild_fixes_scores_drift(self, admin_client, admin,
+                                           user_client, user):
+        from reviews.models import TitleScore
+
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        call_command('rebuild_ratings', '--check')
+
+        TitleScore.objects.filter(title_id=title_id).delete()
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+        call_command('rebuild_ratings')
+        assert self.get_scores(admin_client, title_id) == {'5': 2}, (
+            'Проверьте, что команда `rebuild_ratings` находит и исправляет '
+            'расхождение только в распределении оценок.'
+        )